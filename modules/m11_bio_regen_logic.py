@@ -5,10 +5,22 @@ Automated management of closed-loop biological life support systems (CLLS).
 Optimizes biomass yield through adaptive stress response.
 """
 
+import numpy as np
+
+try:
+    from modules.m11_logging import get_logger
+except ImportError:  # executed as a standalone script from /modules
+    from m11_logging import get_logger
+
+GROWTH_FACTOR = 1.05  # Yield multiplier per step under optimal pressure
+DECAY_FACTOR = 0.98  # Yield multiplier per step without challenge
+O2_GAIN = 5.5  # O2 output added per step under optimal pressure
+
 class BioRegenSystem:
     def __init__(self):
         self.biomass_yield = 1.0
         self.o2_output = 100.0
+        self.log = get_logger("Bio-Regen")
         # Adaptive stress trigger to prevent biological stagnation
         self.hormesis_threshold = 0.618 
 
@@ -17,22 +29,49 @@ class BioRegenSystem:
         Calculates the necessary environmental pressure to 
         maximize nutrient density and oxygen production.
         """
-        print(f"[Bio-Regen] Monitoring biomass at load: {environment_load}")
+        self.log.info("Monitoring biomass at load: %s", environment_load)
         
         # Balancing resource intake vs. environmental resistance
         if environment_load >= self.hormesis_threshold:
             # System strengthens under optimal pressure
-            self.biomass_yield *= 1.05
-            self.o2_output += 5.5
+            self.biomass_yield *= GROWTH_FACTOR
+            self.o2_output += O2_GAIN
             status = "Optimal Hormesis"
         else:
             # Lack of challenge leads to yield degradation
-            self.biomass_yield *= 0.98
+            self.biomass_yield *= DECAY_FACTOR
             status = "Stagnation Warning"
             
-        print(f"[Bio-Regen] Status: {status} | Yield: {self.biomass_yield:.2f}")
+        self.log.info("Status: %s | Yield: %.2f", status, self.biomass_yield)
         return {"yield": self.biomass_yield, "o2": self.o2_output}
 
+    def simulate_modules(self, environment_load, biomass_yield=None, o2_output=None):
+        """
+        Runs the hormesis logic for many grow modules over many steps at once.
+
+        `environment_load` is an (n_modules, n_steps) array (a 1-D array is one
+        module). Yield after t steps is y0 * 1.05**k * 0.98**(t - k), where k
+        is the running count of optimal steps, so the trajectory comes from a
+        cumulative sum of the threshold mask in log space instead of a loop.
+        Initial yield / O2 default to this system's current state and may be
+        per-module arrays. Returns per-module trajectories; `self` is not
+        modified.
+        """
+        loads = np.atleast_2d(np.asarray(environment_load, dtype=np.float64))
+        n_steps = loads.shape[1]
+        y0 = np.asarray(self.biomass_yield if biomass_yield is None else biomass_yield, dtype=np.float64)
+        o0 = np.asarray(self.o2_output if o2_output is None else o2_output, dtype=np.float64)
+
+        optimal = loads >= self.hormesis_threshold
+        k = np.cumsum(optimal, axis=1)
+        t = np.arange(1, n_steps + 1)
+        log_growth = k * np.log(GROWTH_FACTOR) + (t - k) * np.log(DECAY_FACTOR)
+        return {
+            "yield": y0.reshape(-1, 1) * np.exp(log_growth),
+            "o2": o0.reshape(-1, 1) + O2_GAIN * k,
+            "optimal": optimal,
+        }
+
 if __name__ == "__main__":
     eco = BioRegenSystem()
     eco.update_homeostasis(0.75) # Testing with optimal pressure
@@ -0,0 +1,139 @@
+"""
+MARS-11: Injectable Clocks
+--------------------------
+Wall-clock and simulated (virtual) time sources with the same interface, so
+perception and retry delays can run at full speed in simulations.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class SystemClock:
+    """Real time: sleeps actually block (or yield to the event loop)."""
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    async def asleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+    def create_task(self, coro):
+        return asyncio.ensure_future(coro)
+
+    async def gather(self, *aws, return_exceptions=False):
+        return await asyncio.gather(*aws, return_exceptions=return_exceptions)
+
+
+class SimulatedClock:
+    """
+    Virtual time: sleeping just advances `now`. The clock counts the tasks
+    registered on it that can still run; async sleepers wait on a heap of
+    wake-up times, and `now` jumps to the earliest one as soon as every
+    registered task is asleep or waiting on children it gathered. Concurrent
+    tasks are thereby charged their critical path
+    (clock.gather(asleep(0.8), asleep(0.05)) ends at 0.8), without looking
+    at event-loop internals.
+
+    Tasks register by being started with create_task()/gather() of this
+    clock, or on their first asleep(). Concurrent work sharing the clock must
+    therefore be started through the clock: a plain asyncio.gather() child
+    is unknown until it first sleeps, so time can run ahead of it. Registered
+    tasks blocked on anything but this clock (real I/O, locks) hold time back.
+    """
+    def __init__(self, start=0.0):
+        self._now = start
+        self._sleepers = []  # heap of (wake time, seq, future)
+        self._seq = itertools.count()
+        self._tasks = set()  # tasks registered on this clock
+        self._running = 0  # registered tasks that are not blocked on the clock
+
+    def now(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self._now += seconds
+
+    def _register(self, task):
+        if task not in self._tasks:
+            self._tasks.add(task)
+            self._running += 1
+            task.add_done_callback(self._task_done)
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        self._running -= 1
+        self._advance()
+
+    def _block(self):
+        self._running -= 1
+        self._advance()
+
+    def _advance(self):
+        """Wakes the earliest sleepers once no registered task can run."""
+        sleepers = self._sleepers
+        if self._running > 0:
+            return
+        while sleepers and sleepers[0][2].cancelled():
+            heapq.heappop(sleepers)
+        if not sleepers:
+            return
+        self._now = max(self._now, sleepers[0][0])
+        while sleepers and sleepers[0][0] <= self._now:
+            _, _, future = heapq.heappop(sleepers)
+            if not future.cancelled():
+                future.set_result(None)
+                self._running += 1
+
+    def create_task(self, coro):
+        """Schedules `coro` as a task registered on this clock."""
+        task = asyncio.ensure_future(coro)
+        self._register(task)
+        return task
+
+    async def asleep(self, seconds):
+        self._register(asyncio.current_task())
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self._now + seconds, next(self._seq), future))
+        self._block()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():  # Cancelled while asleep: running again
+                self._running += 1
+            raise
+
+    async def gather(self, *aws, return_exceptions=False):
+        """
+        asyncio.gather() whose children are registered on this clock. The
+        caller counts as blocked until they have all finished.
+        """
+        self._register(asyncio.current_task())
+        children = [asyncio.ensure_future(aw) for aw in aws]
+        waiting = [True]
+        left = [len(children)]
+
+        def child_done(child):
+            left[0] -= 1
+            # The caller resumes with the last child, or with the first failure
+            failed = not return_exceptions and (child.cancelled() or child.exception() is not None)
+            if waiting[0] and (failed or not left[0]):
+                waiting[0] = False
+                self._running += 1
+
+        for child in children:
+            # Before _task_done, so the caller is runnable again when its child leaves
+            child.add_done_callback(child_done)
+            self._register(child)
+        if children:
+            self._block()
+        try:
+            return await asyncio.gather(*children, return_exceptions=return_exceptions)
+        finally:
+            if waiting[0] and children:  # Resumed early (exception or cancellation)
+                waiting[0] = False
+                self._running += 1
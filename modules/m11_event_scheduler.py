@@ -0,0 +1,127 @@
+"""
+MARS-11: Discrete-Event Scheduler
+---------------------------------
+Heap-based event queue shared by all subsystems. Each subsystem registers
+its own tick rate (which it may change on the fly) and named events such as
+solar flares, alerts or docking completion. Simulated time jumps straight
+to the next event, so quiet periods cost nothing.
+"""
+
+import heapq
+import itertools
+from collections import defaultdict
+
+
+class ScheduledEvent:
+    __slots__ = ('time', 'seq', 'callback', 'args', 'cancelled')
+
+    def __init__(self, time, seq, callback, args):
+        self.time = time
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.time, self.seq) < (other.time, other.seq)
+
+
+class M11EventScheduler:
+    def __init__(self, start=0.0):
+        self.now = start
+        self.events_processed = 0
+        self._queue = []
+        self._seq = itertools.count()
+        self._handlers = defaultdict(list)
+
+    def at(self, time, callback, *args):
+        """Schedules callback(*args) at absolute simulated time `time`."""
+        event = ScheduledEvent(max(time, self.now), next(self._seq), callback, args)
+        heapq.heappush(self._queue, event)
+        return event
+
+    def schedule(self, delay, callback, *args):
+        """Schedules callback(*args) `delay` seconds from now."""
+        return self.at(self.now + delay, callback, *args)
+
+    def cancel(self, event):
+        """Lazily removes an event (or a periodic tick) from the queue."""
+        event.cancelled = True
+
+    def every(self, period, callback, start=None, until=None):
+        """
+        Registers a periodic tick: callback(now) runs every `period` seconds.
+        The callback may return a new period to change its tick rate, or
+        False to stop; returning None keeps the current period. Returns a
+        PeriodicTask that cancel() accepts.
+        """
+        task = PeriodicTask(period, callback, until)
+        task.event = self.at(self.now if start is None else start, self._tick, task)
+        return task
+
+    def _tick(self, task):
+        result = task.callback(self.now)
+        if result is False:
+            return
+        if result is not None:
+            task.period = result
+        if task.until is None or self.now + task.period <= task.until:
+            task.event = self.schedule(task.period, self._tick, task)
+
+    def subscribe(self, name, handler):
+        """handler(now, payload) is called whenever event `name` is emitted."""
+        self._handlers[name].append(handler)
+
+    def emit(self, name, payload=None, delay=0.0):
+        """Dispatches named event `name` to its subscribers after `delay` seconds."""
+        return self.schedule(delay, self._dispatch, name, payload)
+
+    def _dispatch(self, name, payload):
+        for handler in self._handlers.get(name, ()):
+            handler(self.now, payload)
+
+    def run(self, until=None, max_events=None):
+        """Processes events in time order up to simulated time `until`."""
+        processed = 0
+        queue = self._queue
+        while queue:
+            event = queue[0]
+            if until is not None and event.time > until:
+                break
+            heapq.heappop(queue)
+            if event.cancelled:
+                continue
+            self.now = event.time
+            event.callback(*event.args)
+            processed += 1
+            if max_events is not None and processed >= max_events:
+                break
+        if until is not None and (not queue or queue[0].time > until):
+            self.now = max(self.now, until)
+        self.events_processed += processed
+        return processed
+
+    def __len__(self):
+        return sum(1 for event in self._queue if not event.cancelled)
+
+
+class PeriodicTask:
+    """A subsystem tick; cancelling it also drops its queued occurrence."""
+    __slots__ = ('period', 'callback', 'until', 'event', '_cancelled')
+
+    def __init__(self, period, callback, until):
+        self.period = period
+        self.callback = callback
+        self.until = until
+        self.event = None
+        self._cancelled = False
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @cancelled.setter
+    def cancelled(self, value):
+        self._cancelled = value
+        if value and self.event is not None:
+            self.event.cancelled = True
@@ -0,0 +1,229 @@
+"""
+MARS-11: Event & Telemetry Logging
+----------------------------------
+Shared leveled logger for all modules. Messages use lazy %-style arguments
+that are only formatted when a sink actually writes them, sinks can buffer
+records (JSON lines to a file) and, with level OFF, every call is a single
+integer comparison. Console output keeps the classic "[source] message" form.
+
+    log = get_logger("Bio-Regen")
+    log.info("Yield: %.2f", value, module=3)   # extra fields go to structured sinks
+    configure(level=OFF)                       # silence everything (large runs)
+    configure(sinks=[JSONLinesSink("run.jsonl")])
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR', OFF: 'OFF'}
+_LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+def _parse_level(level):
+    if isinstance(level, str):
+        try:
+            return _LEVELS_BY_NAME[level.upper()]
+        except KeyError:
+            raise ValueError(f"unknown log level: {level}") from None
+    return int(level)
+
+
+class LogRecord:
+    """One log event; the message text is only built when a sink asks for it."""
+    __slots__ = ('time', 'level', 'name', 'msg', 'args', 'fields')
+
+    def __init__(self, level, name, msg, args, fields):
+        self.time = time.time()
+        self.level = level
+        self.name = name
+        self.msg = msg
+        self.args = args
+        self.fields = fields
+
+    @property
+    def message(self):
+        return self.msg % self.args if self.args else self.msg
+
+    def as_dict(self):
+        record = {'time': self.time, 'level': LEVEL_NAMES.get(self.level, self.level),
+                  'logger': self.name, 'message': self.message}
+        record.update(self.fields)
+        return record
+
+
+# --- sinks ---------------------------------------------------------------
+
+class ConsoleSink:
+    """
+    Prints "[tag] message" lines. The tag is the `tag` field, else
+    "SOL <n>" for records carrying a `sol` field, else the logger name.
+    """
+    def __init__(self, stream=None):
+        self.stream = stream  # None: whatever sys.stdout is at write time
+
+    def emit(self, record):
+        fields = record.fields
+        tag = fields.get('tag') or (f"SOL {fields['sol']}" if 'sol' in fields else record.name)
+        print(f"[{tag}] {record.message}", file=self.stream or sys.stdout)
+
+    def flush(self):
+        (self.stream or sys.stdout).flush()
+
+    def close(self):
+        self.flush()
+
+
+class JSONLinesSink:
+    """Buffers records and appends them to `path` as JSON lines, `buffer_size` at a time."""
+    def __init__(self, path, buffer_size=4096):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._file = None
+
+    def emit(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write("".join(json.dumps(r.as_dict(), default=str) + "\n" for r in self._buffer))
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MemorySink:
+    """Keeps records in a list (for inspection or tests of a run)."""
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class NullSink:
+    """Discards everything."""
+    def emit(self, record):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# --- loggers -------------------------------------------------------------
+
+class M11Logger:
+    """
+    Named logger. Its effective level is cached on the instance, so a
+    disabled call returns after one comparison without formatting anything.
+    Hot loops can hoist `log.enabled(DEBUG)` out of the loop entirely.
+    """
+    __slots__ = ('name', 'level')
+
+    def __init__(self, name, level):
+        self.name = name
+        self.level = level
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, msg, *args, **fields):
+        if level < self.level:
+            return
+        _emit(LogRecord(level, self.name, msg, args, fields))
+
+    def debug(self, msg, *args, **fields):
+        if DEBUG < self.level:
+            return
+        _emit(LogRecord(DEBUG, self.name, msg, args, fields))
+
+    def info(self, msg, *args, **fields):
+        if INFO < self.level:
+            return
+        _emit(LogRecord(INFO, self.name, msg, args, fields))
+
+    def warning(self, msg, *args, **fields):
+        if WARNING < self.level:
+            return
+        _emit(LogRecord(WARNING, self.name, msg, args, fields))
+
+    def error(self, msg, *args, **fields):
+        if ERROR < self.level:
+            return
+        _emit(LogRecord(ERROR, self.name, msg, args, fields))
+
+
+_loggers = {}
+_overrides = {}  # logger name -> level
+_level = _parse_level(os.environ.get('M11_LOG_LEVEL', 'INFO'))
+_sinks = [ConsoleSink()]
+
+
+def _emit(record):
+    for sink in _sinks:
+        sink.emit(record)
+
+
+def get_logger(name):
+    """Shared logger for `name` (one instance per name)."""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = M11Logger(name, _overrides.get(name, _level))
+    return logger
+
+
+def configure(level=None, sinks=None, levels=None):
+    """
+    Sets the global level, replaces the sink list and/or sets per-logger
+    levels ({'Bio-Regen': 'WARNING'}). Replaced sinks are flushed. Returns the
+    previous settings, so `configure(**previous)` restores them.
+    """
+    global _level, _sinks, _overrides
+    previous = {'level': _level, 'sinks': list(_sinks), 'levels': dict(_overrides)}
+    if level is not None:
+        _level = _parse_level(level)
+    if levels is not None:
+        _overrides = {name: _parse_level(value) for name, value in levels.items()}
+    if sinks is not None:
+        flush()
+        _sinks = list(sinks)
+    for name, logger in _loggers.items():
+        logger.level = _overrides.get(name, _level)
+    return previous
+
+
+def flush():
+    """Flushes every active sink."""
+    for sink in _sinks:
+        sink.flush()
+
+
+atexit.register(flush)
@@ -1,12 +1,24 @@
 import random
-import matplotlib.pyplot as plt
+import numpy as np
+
+try:
+    from modules.m11_telemetry import TelemetryRecorder
+    from modules.m11_logging import get_logger
+except ImportError:  # executed as a standalone script from /modules
+    from m11_telemetry import TelemetryRecorder
+    from m11_logging import get_logger
+
+SWARM_TELEMETRY = {'energy': np.float64, 'integrity': np.float64, 'roles': np.int64}
+# Executive-layer task names -> swarm roles
+TASK_ROLES = {'MAINTENANCE': 'Repair', 'MINING': 'Energy', 'EXPLORATION': 'Build'}
 
 class M11AgenticSwarm:
     def __init__(self, unit_count=15):
         self.unit_count = unit_count
         self.energy = 10.0
         self.integrity = 0.0
-        self.history = {'energy': [], 'integrity': [], 'roles': [], 'time': []}
+        self.history = TelemetryRecorder(SWARM_TELEMETRY)
+        self.log = get_logger("M11-Swarm")
         
         # Initial roles
         self.roles = ["Energy", "Build", "Repair"]
@@ -28,28 +40,48 @@ class M11AgenticSwarm:
             elif self.integrity < 50 and repair_units < 3:
                 if self.units[i] == "Build": self.units[i] = "Repair"
 
-    def run(self, steps=100):
-        print(f"--- M-11 AGENTIC SWARM ACTIVE ({self.unit_count} Units) ---")
+    def reallocate_units(self, role, count):
+        """
+        Executive-layer tasking: moves up to `count` units into `role` (a swarm
+        role or a TASK_ROLES task name). Returns the number of units moved.
+        """
+        role = TASK_ROLES.get(role, role)
+        if role not in self.roles:
+            raise ValueError(f"unknown swarm role: {role}")
+        others = [i for i, unit in enumerate(self.units) if unit != role]
+        chosen = random.sample(others, min(count, len(others)))
+        for i in chosen:
+            self.units[i] = role
+        return len(chosen)
+
+    def _role_counts(self):
+        """Returns the (Energy, Build, Repair) head-count of the swarm."""
+        return self.units.count("Energy"), self.units.count("Build"), self.units.count("Repair")
+
+    def _draw_wear(self):
+        return random.uniform(1, 3)
+
+    def run(self, steps=100, render=False):
+        self.log.info("--- M-11 AGENTIC SWARM ACTIVE (%d Units) ---", self.unit_count)
+        self.history.reserve(steps)
         
         for t in range(steps):
             # 1. Dynamic Adaptation
             self._rebalance_roles()
             
-            # 2. Agentic Leadership (AAB)
-            # Leadership bonus is now tied to having a dedicated 'Energy' Lead if energy is low
-            lead_bonus = 1.4 if (self.energy < 50 and self.units.count("Energy") > 5) else 1.1
+            # 2. Resource Calculation
+            n_energy, n_build, n_repair = self._role_counts()
 
-            # 3. Resource Calculation
-            n_energy = self.units.count("Energy")
-            n_build = self.units.count("Build")
-            n_repair = self.units.count("Repair")
+            # 3. Agentic Leadership (AAB)
+            # Leadership bonus is now tied to having a dedicated 'Energy' Lead if energy is low
+            lead_bonus = 1.4 if (self.energy < 50 and n_energy > 5) else 1.1
 
             # Physics-based progress
             self.energy = min(100, self.energy + (n_energy * 0.8) - 2.0) # -2.0 is base consumption
             
             if self.energy > 20:
                 # Wear and tear vs Repair capacity
-                wear = random.uniform(1, 3)
+                wear = self._draw_wear()
                 repair_effect = n_repair * 0.5
                 net_damage = max(0, wear - repair_effect)
                 
@@ -57,18 +89,20 @@ class M11AgenticSwarm:
                 self.integrity = min(100, self.integrity + build_rate - net_damage)
 
             # Telemetry
-            self.history['energy'].append(self.energy)
-            self.history['integrity'].append(self.integrity)
-            self.history['roles'].append(n_energy) # Tracking energy units as proxy for adaptation
-            self.history['time'].append(t)
+            # roles: energy units tracked as proxy for adaptation
+            self.history.append(self.energy, self.integrity, n_energy)
 
             if self.energy >= 100 and self.integrity >= 100:
-                print(f"Mission Success at T+{t}")
+                self.log.info("Mission Success at T+%d", t)
                 break
 
-        self.visualize()
+        if render:
+            self.visualize()
+        return self.history
 
     def visualize(self):
+        import matplotlib.pyplot as plt
+
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
         
         ax1.plot(self.history['time'], self.history['energy'], color='gold', label='Energy (%)')
@@ -85,5 +119,79 @@ class M11AgenticSwarm:
         
         plt.show()
 
+
+class M11VectorSwarm(M11AgenticSwarm):
+    """
+    Array-backed AAB engine for 10^5-10^6 unit swarms.
+    Roles are stored as int8 codes (see ROLE_CODES), role counts are kept
+    incrementally and the rebalance is one masked step over the whole array.
+    Statistically equivalent to M11AgenticSwarm.
+    """
+    ENERGY, BUILD, REPAIR = 0, 1, 2
+    ROLE_CODES = {"Energy": ENERGY, "Build": BUILD, "Repair": REPAIR}
+
+    def __init__(self, unit_count=15, rng=None):
+        self.unit_count = unit_count
+        self.energy = 10.0
+        self.integrity = 0.0
+        self.history = TelemetryRecorder(SWARM_TELEMETRY)
+        self.log = get_logger("M11-Swarm")
+        self.rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+
+        self.roles = ["Energy", "Build", "Repair"]
+        self.units = self.rng.integers(0, len(self.roles), size=unit_count, dtype=np.int8)
+        self.counts = np.bincount(self.units, minlength=len(self.roles)).astype(np.int64)
+
+    def _reassign(self, mask, role):
+        """Moves every unit selected by `mask` to `role`, keeping counts in sync."""
+        moved = self.units[mask]
+        if moved.size == 0:
+            return
+        self.counts -= np.bincount(moved, minlength=len(self.roles))
+        self.counts[role] += moved.size
+        self.units[mask] = role
+
+    def _rebalance_roles(self):
+        """
+        Vectorized Property 2 (Wisdom) redistribution.
+        Same branch order as the scalar loop: the conditions only depend on
+        swarm-level state, so every unit can be decided in one masked pass.
+        """
+        repair_units = self.counts[self.REPAIR]
+
+        if self.energy < 40:
+            # Only non-Energy units draw, exactly like the short-circuit in the loop.
+            candidates = np.flatnonzero(self.units != self.ENERGY)
+            draws = self.rng.random(candidates.size)
+            to_energy = candidates[draws > 0.7]
+            stay = candidates[draws <= 0.7]
+            if self.integrity < 50 and repair_units < 3:
+                self._reassign(stay[self.units[stay] == self.BUILD], self.REPAIR)
+            self._reassign(to_energy, self.ENERGY)
+        elif self.integrity < self.energy and self.energy > 60:
+            # Units that started as Build skip the Energy branch and fall through to Repair.
+            was_build = self.units == self.BUILD
+            self._reassign(self.units == self.ENERGY, self.BUILD)
+            if self.integrity < 50 and repair_units < 3:
+                self._reassign(was_build, self.REPAIR)
+        elif self.integrity < 50 and repair_units < 3:
+            self._reassign(self.units == self.BUILD, self.REPAIR)
+
+    def reallocate_units(self, role, count):
+        name = TASK_ROLES.get(role, role)
+        if name not in self.ROLE_CODES:
+            raise ValueError(f"unknown swarm role: {name}")
+        role = self.ROLE_CODES[name]
+        others = np.flatnonzero(self.units != role)
+        chosen = self.rng.choice(others, size=min(count, others.size), replace=False)
+        self._reassign(chosen, role)
+        return int(chosen.size)
+
+    def _role_counts(self):
+        return int(self.counts[self.ENERGY]), int(self.counts[self.BUILD]), int(self.counts[self.REPAIR])
+
+    def _draw_wear(self):
+        return self.rng.uniform(1, 3)
+
 if __name__ == "__main__":
-    M11AgenticSwarm().run()
+    M11AgenticSwarm().run(render=True)
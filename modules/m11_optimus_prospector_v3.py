@@ -1,17 +1,64 @@
+from collections import deque
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+try:
+    from modules.m11_logging import get_logger
+except ImportError:  # executed as a standalone script from /modules
+    from m11_logging import get_logger
+
+
+class RunningStats:
+    """
+    Welford running mean/variance with O(1) memory per tracked value.
+    Works on a single value (shape=()) or elementwise on arrays, where
+    update() can target a subset of cells via `idx`.
+    """
+    def __init__(self, shape=()):
+        self.n = np.zeros(shape, dtype=np.int64)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, value, idx=Ellipsis):
+        n = self.n[idx] + 1
+        delta = value - self.mean[idx]
+        mean = self.mean[idx] + delta / n
+        self.m2[idx] += delta * (value - mean)
+        self.mean[idx] = mean
+        self.n[idx] = n
+
+    def variance_at(self, idx=Ellipsis):
+        n = self.n[idx]
+        return np.where(n > 1, self.m2[idx] / np.maximum(n - 1, 1), 0.0)
+
+    def stderr_at(self, idx=Ellipsis):
+        return np.sqrt(self.variance_at(idx) / np.maximum(self.n[idx], 1))
+
+    @property
+    def variance(self):
+        return self.variance_at()
+
+    @property
+    def stderr(self):
+        return self.stderr_at()
+
 
 class M11GIEPProspector:
     """
     GIEP (Inertial Signal Purification) - Reference Implementation.
     Focus: Multimodal sensor fusion with confidence accumulation.
     """
-    def __init__(self):
+    def __init__(self, weights=None, history_size=None):
         self.threshold = 0.80
         self.memory = 0.5 # Starting with neutral bias
         self.alpha = 0.3  # Learning rate (inertia factor)
-        self.weights = [0.5, 0.3, 0.2] # GPR, Neutron, Thermal
-        self.history = []
+        self.weights = [0.5, 0.3, 0.2] if weights is None else list(weights) # GPR, Neutron, Thermal
+        self.n_sensors = len(self.weights)
+        # Full history by default; `history_size` keeps only the latest N values (ring buffer)
+        self.history = [] if history_size is None else deque(maxlen=history_size)
+        self.last_confidence = None # Instant (pre-inertia) confidence of the last fusion
+        self.grid_memory = None # Per-cell memory for grid scans
+        self.log = get_logger("GIEP-Prospector")
 
     def purification_logic(self, raw_data):
         """
@@ -25,30 +72,128 @@ class M11GIEPProspector:
         damping = max(0.1, 1.0 - (divergence * 0.5)) # GPT fix: no negative damping
         
         instant_confidence = weighted_val * damping
+        self.last_confidence = instant_confidence
         
         # 3. Temporal Inertia (Property 10: Opora)
         # New value = (1-alpha)*Old + alpha*New
         self.memory = ((1 - self.alpha) * self.memory) + (self.alpha * instant_confidence)
         return self.memory
 
-    def scan_cycle(self, iterations=10):
-        print(f"--- GIEP Accumulative Scan Initiated ---")
+    def reset_grid(self, n_cells):
+        """Starts a grid scan: one neutral-bias memory value per cell."""
+        self.grid_memory = np.full(n_cells, 0.5)
+        return self.grid_memory
+
+    def purify_grid(self, readings):
+        """
+        Grid mode of purification_logic.
+        Fuses an (n_cells, n_sensors) reading matrix in one step (weighted
+        average, per-row std damping, per-cell EMA update) and returns the
+        updated memory together with the mask of cells above `threshold`.
+        """
+        readings = np.asarray(readings, dtype=np.float64)
+        if self.grid_memory is None or self.grid_memory.shape[0] != readings.shape[0]:
+            self.reset_grid(readings.shape[0])
+
+        # 3. Temporal Inertia
+        memory = self.grid_memory
+        memory *= (1 - self.alpha)
+        memory += self.alpha * self._fuse_grid(readings)
+        return memory, memory > self.threshold
+
+    def _fuse_grid(self, readings):
+        """Instant confidence per row of an (n_cells, n_sensors) reading matrix."""
+        # 1. Spatial Fusion
+        weights = np.asarray(self.weights, dtype=np.float64)
+        weighted_val = readings @ (weights / weights.sum())
+
+        # 2. Coherence Check (Damping)
+        divergence = readings.std(axis=1)
+        damping = np.maximum(0.1, 1.0 - (divergence * 0.5))
+        return weighted_val * damping
+
+    def _decide(self, stats, z, min_samples, idx=Ellipsis):
+        """+1 (drill) / -1 (reject) once the mean confidence is z standard errors away from threshold, else 0."""
+        mean = stats.mean[idx]
+        margin = z * stats.stderr_at(idx)
+        ready = stats.n[idx] >= min_samples
+        above = ready & (mean - margin > self.threshold)
+        below = ready & (mean + margin < self.threshold)
+        return above.astype(np.int8) - below.astype(np.int8)
+
+    def scan_until_decided(self, base=0.85, max_iterations=50, z=2.0, min_samples=3):
+        """
+        Sequential-decision scan of one cell.
+        Keeps a Welford mean/variance of the fused (instant) confidence and
+        stops as soon as it is statistically above or below `threshold`,
+        instead of always spending `max_iterations` cycles.
+        Returns {'decision': 'DRILL' | 'REJECT' | 'UNDECIDED', 'iterations', 'mean', 'stderr'}.
+        """
+        stats = RunningStats()
+        decision = 0
+        for _ in range(max_iterations):
+            raw = np.random.normal(base, 0.15, size=self.n_sensors)
+            purified = self.purification_logic(raw)
+            self.history.append(purified)
+            stats.update(self.last_confidence)
+
+            decision = int(self._decide(stats, z, min_samples))
+            if decision:
+                break
+
+        return {'decision': {1: "DRILL", -1: "REJECT", 0: "UNDECIDED"}[decision],
+                'iterations': int(stats.n), 'mean': float(stats.mean), 'stderr': float(stats.stderr)}
+
+    def scan_grid_until_decided(self, bases, max_iterations=50, z=2.0, min_samples=3):
+        """
+        Grid version of scan_until_decided: cells drop out of the scan as soon
+        as they are decided, so only still-ambiguous cells are read each cycle.
+        `bases` holds the true signal level per cell (simulated environment).
+        Returns (decision array of +1/-1/0, iterations spent per cell).
+        """
+        bases = np.asarray(bases, dtype=np.float64)
+        n_cells = bases.shape[0]
+        self.reset_grid(n_cells)
+        stats = RunningStats(n_cells)
+        decision = np.zeros(n_cells, dtype=np.int8)
+        active = np.arange(n_cells)
+
+        for _ in range(max_iterations):
+            if active.size == 0:
+                break
+            raw = np.random.normal(bases[active, None], 0.15, size=(active.size, self.n_sensors))
+            instant = self._fuse_grid(raw)
+            self.grid_memory[active] = (1 - self.alpha) * self.grid_memory[active] + self.alpha * instant
+            stats.update(instant, active)
+
+            decided = self._decide(stats, z, min_samples, active)
+            decision[active] = decided
+            active = active[decided == 0]
+
+        return decision, stats.n
+
+    def scan_cycle(self, iterations=10, render=False):
+        self.log.info("--- GIEP Accumulative Scan Initiated ---")
         for i in range(iterations):
             # Simulate environment (first 4 cycles - noise, then 6 cycles - signal)
             base = 0.85 if i > 4 else 0.4
-            raw = [np.random.normal(base, 0.15) for _ in range(3)]
+            raw = np.random.normal(base, 0.15, size=self.n_sensors)
             
             purified = self.purification_logic(raw)
             self.history.append(purified)
             
             status = "STABLE_SIGNAL" if purified > self.threshold else "SCANNING"
-            print(f"Cycle {i}: Confidence {purified:.2f} | {status}")
+            self.log.info("Cycle %d: Confidence %.2f | %s", i, purified, status)
 
-        self.visualize()
+        if render:
+            self.visualize()
+        return self.history
 
     def visualize(self):
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(10, 5))
-        plt.plot(self.history, color='cyan', marker='o', lw=2, label='GIEP Purified Confidence')
+        plt.plot(list(self.history), color='cyan', marker='o', lw=2, label='GIEP Purified Confidence')
         plt.axhline(y=self.threshold, color='red', ls='--', label='Drill Threshold')
         plt.fill_between(range(len(self.history)), self.threshold, 1.0, color='green', alpha=0.1, label='Decision Zone')
         plt.title("M-11 Prospector: Accumulative GIEP Logic")
@@ -59,4 +204,4 @@ class M11GIEPProspector:
         plt.show()
 
 if __name__ == "__main__":
-    M11GIEPProspector().scan_cycle()
+    M11GIEPProspector().scan_cycle(render=True)
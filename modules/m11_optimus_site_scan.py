@@ -1,37 +1,261 @@
+import heapq
+import os
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+try:
+    from modules.m11_logging import get_logger
+except ImportError:  # executed as a standalone script from /modules
+    from m11_logging import get_logger
+
+
+def open_terrain(path, shape=None, dtype=np.float32):
+    """
+    Opens a terrain raster read-only without loading it into RAM.
+    .npy files carry their own shape/dtype; raw rasters need `shape`.
+    """
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    if shape is None:
+        raise ValueError("shape is required for raw terrain rasters")
+    return np.memmap(path, dtype=dtype, mode='r', shape=tuple(shape))
+
+
+def _block_counts(length, block):
+    """Number of cells in each block of size `block` along an axis of `length`."""
+    return np.diff(np.append(np.arange(0, length, block), length))
+
+
+def window_stats(block, footprint):
+    """
+    Local mean and variance of every footprint x footprint window of `block`,
+    computed with summed-area tables. Window (i, j) covers
+    block[i:i + footprint, j:j + footprint].
+    """
+    a = np.asarray(block, dtype=np.float64)
+    offset = a.mean()  # Centering keeps the squared sums well conditioned
+    a = a - offset
+
+    rows, cols = a.shape
+    sat = np.zeros((rows + 1, cols + 1))
+    sat2 = np.zeros((rows + 1, cols + 1))
+    np.cumsum(np.cumsum(a, axis=0), axis=1, out=sat[1:, 1:])
+    np.cumsum(np.cumsum(a * a, axis=0), axis=1, out=sat2[1:, 1:])
+
+    f = footprint
+    def box(s):
+        return s[f:, f:] - s[:-f, f:] - s[f:, :-f] + s[:-f, :-f]
+
+    n = f * f
+    mean = box(sat) / n
+    var = box(sat2) / n - mean * mean
+    # E[x^2] - E[x]^2 cancels: anything within the rounding error of the
+    # summed-area tables is zero (sqrt would turn 1e-13 into 3e-7)
+    tol = (rows + cols) * np.finfo(np.float64).eps * sat2[-1, -1] / n
+    var[var <= tol] = 0.0
+    return mean + offset, var
+
+
+def _top_k(scores, k):
+    """Flat indices of the k lowest scores, in ascending score order."""
+    flat = scores.ravel()
+    k = min(k, flat.size)
+    if k < flat.size:
+        idx = np.argpartition(flat, k - 1)[:k]
+    else:
+        idx = np.arange(flat.size)
+    return idx[np.argsort(flat[idx], kind='stable')]
+
 
 class OptimusSiteSurvey:
-    def __init__(self, grid_size=20):
-        self.grid_size = grid_size
-        # Simulate Martian terrain roughness (entropy levels)
-        self.terrain = np.random.rand(grid_size, grid_size) * 10 
+    def __init__(self, grid_size=20, terrain=None):
+        if terrain is None:
+            # Simulate Martian terrain roughness (entropy levels)
+            terrain = np.random.rand(grid_size, grid_size) * 10 
+        self.terrain = terrain
+        self.grid_size = terrain.shape[0]
+        self.pyramid = None
+        self.last_scan = {}
+        self.log = get_logger("M11-Site-Survey")
+
+    @classmethod
+    def from_raster(cls, path, shape=None, dtype=np.float32, block_size=256, levels=4, cache_dir=None):
+        """Memory-maps a terrain raster (raw or .npy) and attaches its cached pyramid."""
+        survey = cls(terrain=open_terrain(path, shape, dtype))
+        survey.build_pyramid(block_size, levels, cache_dir or path + ".pyramid", source_path=path)
+        return survey
+
+    def build_pyramid(self, block_size=256, levels=4, cache_dir=None, source_path=None):
+        """
+        Multi-resolution min/mean pyramid: level i summarizes blocks of
+        block_size * 2**i cells. Level 0 is built in one streaming pass over
+        the terrain, coarser levels from the level below. With `cache_dir`
+        the levels are stored as .npy files and reused while newer than
+        `source_path`.
+        """
+        self.pyramid = []
+        rows, cols = self.terrain.shape
+        for level in range(levels):
+            block = block_size * 2 ** level
+            cached = self._load_level(cache_dir, block, source_path)
+            if cached is None:
+                if level == 0:
+                    mins, means = self._reduce_terrain(block)
+                else:
+                    mins, means = self._reduce_level(self.pyramid[-1], rows, cols)
+                if cache_dir is not None:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    np.save(os.path.join(cache_dir, f"b{block}_min.npy"), mins)
+                    np.save(os.path.join(cache_dir, f"b{block}_mean.npy"), means)
+                cached = {'block': block, 'min': mins, 'mean': means}
+            self.pyramid.append(cached)
+        return self.pyramid
+
+    @staticmethod
+    def _load_level(cache_dir, block, source_path):
+        if cache_dir is None:
+            return None
+        min_path = os.path.join(cache_dir, f"b{block}_min.npy")
+        mean_path = os.path.join(cache_dir, f"b{block}_mean.npy")
+        if not (os.path.exists(min_path) and os.path.exists(mean_path)):
+            return None
+        if source_path is not None and os.path.getmtime(min_path) < os.path.getmtime(source_path):
+            return None
+        return {'block': block, 'min': np.load(min_path, mmap_mode='r'), 'mean': np.load(mean_path, mmap_mode='r')}
+
+    def _reduce_terrain(self, block):
+        rows, cols = self.terrain.shape
+        starts = np.arange(0, cols, block)
+        mins, sums = [], []
+        for r0 in range(0, rows, block):
+            band = np.asarray(self.terrain[r0:r0 + block], dtype=np.float64)
+            mins.append(np.minimum.reduceat(band.min(axis=0), starts))
+            sums.append(np.add.reduceat(band.sum(axis=0), starts))
+        counts = np.outer(_block_counts(rows, block), _block_counts(cols, block))
+        return np.array(mins), np.array(sums) / counts
+
+    @staticmethod
+    def _reduce_level(finer, rows, cols):
+        block = finer['block']
+        mins = np.asarray(finer['min'])
+        sums = np.asarray(finer['mean']) * np.outer(_block_counts(rows, block), _block_counts(cols, block))
+        r_idx, c_idx = np.arange(0, mins.shape[0], 2), np.arange(0, mins.shape[1], 2)
+        mins = np.minimum.reduceat(np.minimum.reduceat(mins, r_idx, axis=0), c_idx, axis=1)
+        sums = np.add.reduceat(np.add.reduceat(sums, r_idx, axis=0), c_idx, axis=1)
+        counts = np.outer(_block_counts(rows, 2 * block), _block_counts(cols, 2 * block))
+        return mins, sums / counts
 
     def analyze_site(self):
         """
         Implementation of Property 10 (Anchor).
         Scans the terrain to find the point of minimum entropy for structural stability.
         """
-        print("--- m-11 phase IV: optimus site survey initiated ---")
-        best_score = float('inf')
-        best_coord = (0, 0)
-
-        # Iterate through the grid to find the most stable coordinate
-        for x in range(self.grid_size):
-            for y in range(self.grid_size):
-                # Analyze local surface variation (Property 7: Balance)
-                local_noise = self.terrain[x, y]
-                
-                if local_noise < best_score:
-                    best_score = local_noise
-                    best_coord = (x, y)
+        self.log.info("--- m-11 phase IV: optimus site survey initiated ---")
+        if self.pyramid is not None:
+            (x, y), _ = self.scan_pruned(k=1, footprint=1)[0]
+            return (x, y), float(self.terrain[x, y])  # The cell itself, not its rounded window stats
+
+        # Analyze local surface variation (Property 7: Balance)
+        flat_idx = int(np.argmin(self.terrain))
+        x, y = np.unravel_index(flat_idx, self.terrain.shape)
+        best_score = self.terrain[x, y]
         
-        return best_coord, best_score
+        return (int(x), int(y)), best_score
+
+    def stability_map(self, footprint=3, variance_weight=1.0, terrain=None):
+        """
+        Windowed stability score for a landing pad covering footprint x footprint cells:
+        local mean roughness plus `variance_weight` times its local standard deviation.
+        Entry (x, y) scores the pad whose upper-left cell is (x, y).
+        """
+        terrain = self.terrain if terrain is None else terrain
+        mean, var = window_stats(terrain, footprint)
+        return mean + variance_weight * np.sqrt(var)
+
+    def top_candidates(self, k=5, footprint=3, variance_weight=1.0):
+        """Returns the k most stable anchor points as [((x, y), score), ...]."""
+        scores = self.stability_map(footprint, variance_weight)
+        cols = scores.shape[1]
+        return [((int(i // cols), int(i % cols)), float(scores.flat[i])) for i in _top_k(scores, k)]
+
+    def scan_tiles(self, terrain=None, k=5, footprint=3, variance_weight=1.0, tile_size=2048):
+        """
+        Tiled top-k search for terrains larger than RAM.
+        `terrain` may be an array, a np.memmap or the path of a .npy file (opened
+        memory-mapped); only one tile plus a (footprint - 1) halo is read at a time.
+        """
+        if terrain is None:
+            terrain = self.terrain
+        elif isinstance(terrain, str):
+            terrain = np.load(terrain, mmap_mode='r')
+
+        rows = terrain.shape[0] - footprint + 1
+        cols = terrain.shape[1] - footprint + 1
+        best = []  # max-heap of (-score, x, y) holding the k best anchors so far
+
+        for r0 in range(0, rows, tile_size):
+            for c0 in range(0, cols, tile_size):
+                self._merge_tile(best, terrain, r0, c0, min(r0 + tile_size, rows), min(c0 + tile_size, cols),
+                                 k, footprint, variance_weight)
+
+        return [((x, y), -neg) for neg, x, y in sorted(best, reverse=True)]
+
+    def scan_pruned(self, k=5, footprint=3, variance_weight=1.0, level=0):
+        """
+        Best-first top-k search over the pyramid blocks of `level`.
+        A pad's score is never below the minimum cell it covers, so a block
+        whose min-pyramid bound (including the footprint halo in the
+        neighbouring blocks) is not better than the current k-th anchor is
+        skipped without reading its cells. Requires build_pyramid() and
+        variance_weight >= 0; the fraction of tiles read is kept in last_scan.
+        """
+        if self.pyramid is None:
+            self.build_pyramid()
+        block = self.pyramid[level]['block']
+        if footprint - 1 > block:
+            raise ValueError("footprint must not exceed the pyramid block size + 1")
+
+        # Lower bound per block: min over the block and its right/lower/diagonal neighbours
+        mins = np.pad(np.asarray(self.pyramid[level]['min']), ((0, 1), (0, 1)), constant_values=np.inf)
+        bound = np.minimum(np.minimum(mins[:-1, :-1], mins[1:, :-1]), np.minimum(mins[:-1, 1:], mins[1:, 1:]))
+
+        rows = self.terrain.shape[0] - footprint + 1
+        cols = self.terrain.shape[1] - footprint + 1
+        best = []
+        tiles_read = 0
+        for flat in np.argsort(bound, axis=None, kind='stable'):
+            if len(best) == k and bound.flat[flat] >= -best[0][0]:
+                break
+            bi, bj = divmod(int(flat), bound.shape[1])
+            r0, c0 = bi * block, bj * block
+            if r0 >= rows or c0 >= cols:
+                continue
+            self._merge_tile(best, self.terrain, r0, c0, min(r0 + block, rows), min(c0 + block, cols),
+                             k, footprint, variance_weight)
+            tiles_read += 1
+
+        self.last_scan = {'tiles_read': tiles_read, 'tiles_total': bound.size,
+                          'fraction_read': tiles_read / bound.size}
+        return [((x, y), -neg) for neg, x, y in sorted(best, reverse=True)]
+
+    def _merge_tile(self, best, terrain, r0, c0, r1, c1, k, footprint, variance_weight):
+        """Scores pad origins [r0:r1, c0:c1] and merges the tile's top-k into the `best` heap."""
+        block = terrain[r0:r1 + footprint - 1, c0:c1 + footprint - 1]
+        scores = self.stability_map(footprint, variance_weight, terrain=block)
+        for i in _top_k(scores, k):
+            x, y = divmod(int(i), scores.shape[1])
+            item = (-float(scores.flat[i]), r0 + x, c0 + y)
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
 
     def visualize_landing_zone(self, best_coord):
         """
         Generates a heatmap of the landing zone and marks the chosen Anchor Point.
         """
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(8, 6))
         plt.imshow(self.terrain, cmap='copper')
         plt.colorbar(label='terrain roughness (entropy)')
@@ -0,0 +1,125 @@
+"""
+MARS-11: Stage Profiler
+-----------------------
+Opt-in instrumentation for multi-stage protocols. Every stage records wall
+time, CPU time (of the thread that ran it, so concurrent stages stay
+separate) and a call count; durations aggregate into per-stage histograms
+across sols and can be exported as JSON or as a Chrome trace
+(chrome://tracing, Perfetto). Pluggable hooks wrap each stage:
+
+    profiler = StageProfiler()
+    profiler.add_callback(lambda record: ...)     # called after every stage
+    profiler.add_hook(lambda stage, sol: ctx)      # context manager around it
+
+Callers that are not profiling use NULL_STAGE, a shared no-op context
+manager, so the disabled path costs one `with` on a nullcontext.
+"""
+
+import os
+import json
+import time
+import threading
+import contextlib
+
+import numpy as np
+
+NULL_STAGE = contextlib.nullcontext()
+
+# Log-spaced duration bins (1 us .. 100 s) for the per-stage histograms
+HISTOGRAM_EDGES = np.logspace(-6, 2, 25)
+
+
+class StageProfiler:
+    def __init__(self, trace=True):
+        self.trace = trace  # Keep individual spans for the Chrome trace export
+        self.wall = {}  # stage -> list of wall durations (s)
+        self.cpu = {}  # stage -> list of CPU durations (s)
+        self.counters = {}
+        self.spans = []
+        self.callbacks = []
+        self.hooks = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """callback(record) runs after each stage with its timing record."""
+        self.callbacks.append(callback)
+
+    def add_hook(self, hook):
+        """hook(stage, sol) returns a context manager entered around each stage."""
+        self.hooks.append(hook)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextlib.contextmanager
+    def stage(self, name, sol=None):
+        """Times the enclosed block as stage `name` (of sol `sol`)."""
+        with contextlib.ExitStack() as hooks:
+            for hook in self.hooks:
+                hooks.enter_context(hook(name, sol))
+            start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                yield
+            finally:
+                wall = time.perf_counter() - start
+                cpu = time.thread_time() - cpu_start
+                self._record(name, sol, start, wall, cpu)
+
+    def _record(self, name, sol, start, wall, cpu):
+        record = {'stage': name, 'sol': sol, 'wall': wall, 'cpu': cpu,
+                  'start': start - self._origin, 'thread': threading.get_ident()}
+        with self._lock:
+            self.wall.setdefault(name, []).append(wall)
+            self.cpu.setdefault(name, []).append(cpu)
+            if self.trace:
+                self.spans.append(record)
+        for callback in self.callbacks:
+            callback(record)
+
+    def reset(self):
+        with self._lock:
+            self.wall.clear()
+            self.cpu.clear()
+            self.counters.clear()
+            self.spans.clear()
+            self._origin = time.perf_counter()
+
+    # --- aggregation & export ------------------------------------------
+
+    def summary(self):
+        """Per-stage calls, wall/CPU totals, wall percentiles and duration histogram."""
+        with self._lock:
+            stages = {name: (np.array(self.wall[name]), np.array(self.cpu[name])) for name in self.wall}
+            counters = dict(self.counters)
+        out = {}
+        for name, (wall, cpu) in stages.items():
+            counts, _ = np.histogram(wall, bins=HISTOGRAM_EDGES)
+            out[name] = {
+                'calls': int(wall.size),
+                'wall_total': float(wall.sum()),
+                'cpu_total': float(cpu.sum()),
+                'wall_mean': float(wall.mean()),
+                'wall_p50': float(np.percentile(wall, 50)),
+                'wall_p90': float(np.percentile(wall, 90)),
+                'wall_p99': float(np.percentile(wall, 99)),
+                'wall_max': float(wall.max()),
+                'histogram': counts.tolist(),
+            }
+        return {'stages': out, 'counters': counters, 'histogram_edges': HISTOGRAM_EDGES.tolist()}
+
+    def to_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def to_chrome_trace(self, path):
+        """Writes the recorded spans in Chrome trace-event format (microseconds)."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = [{'name': s['stage'], 'cat': 'stage', 'ph': 'X', 'pid': pid, 'tid': s['thread'],
+                   'ts': s['start'] * 1e6, 'dur': s['wall'] * 1e6,
+                   'args': {'sol': s['sol'], 'cpu_ms': s['cpu'] * 1e3}} for s in spans]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
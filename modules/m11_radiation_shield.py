@@ -1,12 +1,117 @@
+import math
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+try:
+    from modules.m11_telemetry import TelemetryRecorder
+    from modules.m11_logging import get_logger
+except ImportError:  # executed as a standalone script from /modules
+    from m11_telemetry import TelemetryRecorder
+    from m11_logging import get_logger
+
+class FlareForecaster:
+    """
+    Ahead-of-time flare forecast with O(1) work per sample.
+    Holt-style exponentially weighted level + trend of the flux, plus a ring
+    buffer of the last `window` samples with running sums for rolling
+    volatility. Forecasts and pulse costs for any h <= horizon seconds are
+    closed-form lookups, so nothing is recomputed across overlapping windows.
+    """
+    def __init__(self, horizon=30, window=60, alpha=0.3, beta=0.1, threshold=80.0):
+        self.horizon = horizon
+        self.alpha = alpha
+        self.beta = beta
+        self.threshold = threshold
+        self.level = None
+        self.trend = 0.0
+        self._ring = np.zeros(window)
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def update(self, flux):
+        # Ring buffer with running sums
+        window = self._ring.size
+        if self._count == window:
+            old = self._ring[self._pos]
+            self._sum -= old
+            self._sumsq -= old * old
+        else:
+            self._count += 1
+        self._ring[self._pos] = flux
+        self._pos = (self._pos + 1) % window
+        self._sum += flux
+        self._sumsq += flux * flux
+
+        # Exponentially weighted level and trend
+        if self.level is None:
+            self.level = flux
+            return
+        prev = self.level
+        self.level = self.alpha * flux + (1 - self.alpha) * (self.level + self.trend)
+        self.trend = self.beta * (self.level - prev) + (1 - self.beta) * self.trend
+
+    @property
+    def volatility(self):
+        """Rolling standard deviation of the last `window` samples."""
+        if self._count < 2:
+            return 0.0
+        mean = self._sum / self._count
+        return math.sqrt(max(0.0, self._sumsq / self._count - mean * mean))
+
+    def forecast(self, h):
+        """Expected flux `h` seconds ahead."""
+        return self.level + h * self.trend
+
+    def flare_eta(self):
+        """Seconds until the forecast crosses `threshold` within the horizon, else None."""
+        if self.level is None:
+            return None
+        if self.level > self.threshold:
+            return 0
+        if self.trend <= 0:
+            return None
+        eta = max(1, math.floor((self.threshold - self.level) / self.trend) + 1)
+        return eta if eta <= self.horizon else None
+
+    def pulse_cost(self, h):
+        """Precomputed pulse cost h seconds ahead (same flux / 20 rule as the shield)."""
+        flux = self.forecast(h)
+        return flux / 20 if flux > self.threshold else 0.0
+
+    def expected_pulse_energy(self):
+        """
+        Total forecast pulse cost over the next `horizon` seconds (arithmetic
+        series, O(1)). A receding flare (level above threshold, trend < 0)
+        only counts the steps whose forecast is still above threshold.
+        """
+        eta = self.flare_eta()
+        if eta is None:
+            return 0.0
+        first, last = max(eta, 1), self.horizon
+        if self.trend < 0:
+            # Last h with level + h * trend > threshold (strict, as in pulse_cost)
+            last = min(last, math.ceil((self.threshold - self.level) / self.trend) - 1)
+        n = last - first + 1
+        if n <= 0:
+            return 0.0
+        # sum_{h=first}^{last} (level + h * trend) / 20
+        return (n * self.level + self.trend * (first + last) * n / 2) / 20
+
 
 class M11SmartShield:
-    def __init__(self):
+    def __init__(self, forecaster=None, precharge_rate=2.0, reserve=20.0):
         self.energy_bank = 100.0  # Percentage
         self.solar_input = 0.5    # Constant recharge from panels
-        self.history = {'energy': [], 'flux': [], 'threats': [], 'time': []}
+        # Optional predictive layer: pre-charge from base power before a forecast flare
+        self.forecaster = forecaster
+        self.precharge_rate = precharge_rate
+        self.reserve = reserve
+        self.precharge_drawn = 0.0
+        self.history = TelemetryRecorder({'energy': np.float64, 'flux': np.float64, 'threats': np.int8})
         self.prev_flux = 50.0
+        self.log = get_logger("M11-Shield")
 
     def analyze_threat(self, current_flux):
         """
@@ -20,35 +125,146 @@ class M11SmartShield:
         is_threat = (current_flux > 80) or (delta > 15)
         return is_threat, delta
 
-    def run_simulation(self, duration=60):
-        print("--- m-11 phase III: smart pulse shield active ---")
+    def analyze_series(self, flux):
+        """
+        Vectorized analyze_threat over a whole flux series.
+        Deltas are taken against self.prev_flux for the first sample, and
+        prev_flux is carried forward so consecutive chunks join seamlessly.
+        """
+        flux = np.asarray(flux, dtype=np.float64)
+        delta = np.diff(flux, prepend=self.prev_flux)
+        if flux.size:
+            self.prev_flux = float(flux[-1])
+        is_threat = (flux > 80) | (delta > 15)
+        return is_threat, delta
+
+    def replay(self, flux, record=False):
+        """
+        Replays a recorded flux series (1 sample per second) in one pass.
+        The clamped recurrence e[t] = min(100, e[t-1] - cost[t] + solar_input)
+        has the closed form e[t] = S[t] + min(e0, 100 - max(S[1..t])) with
+        S = cumsum(solar_input - cost), so no per-sample loop is needed.
+        With a forecaster, pre-charging depends on the bank level and has no
+        closed form, so the series goes through step() sample by sample (same
+        trajectory as run_simulation, at loop speed).
+        Energy bank, prev_flux and the forecaster state carry across calls.
+        """
+        flux = np.asarray(flux, dtype=np.float64)
+        if self.forecaster is not None:
+            delta = np.diff(flux, prepend=self.prev_flux)
+            is_threat = np.empty(flux.size, dtype=bool)
+            cost = np.empty(flux.size)
+            energy = np.empty(flux.size)
+            for i, sample in enumerate(flux.tolist()):
+                is_threat[i], cost[i] = self.step(sample)
+                energy[i] = self.energy_bank
+        else:
+            is_threat, delta = self.analyze_series(flux)
+            cost = np.where(is_threat, flux / 20, 0.0)
+
+            balance = np.cumsum(self.solar_input - cost)
+            energy = balance + np.minimum(self.energy_bank, 100.0 - np.maximum.accumulate(balance))
+            if energy.size:
+                self.energy_bank = float(energy[-1])
+
+        if record:
+            self.history.extend(energy=energy, flux=flux, threats=np.where(is_threat, 100, 0))
+        return {'energy': energy, 'threats': is_threat, 'delta': delta, 'cost': cost}
+
+    def replay_chunks(self, source, chunk_size=86400):
+        """
+        Streams a long flux recording through replay() chunk by chunk.
+        `source` is an array or the path of a .npy file (opened memory-mapped),
+        so months of 1 Hz data never have to fit in RAM. Yields one summary
+        dict per chunk.
+        """
+        flux = np.load(source, mmap_mode='r') if isinstance(source, str) else source
+        for start in range(0, len(flux), chunk_size):
+            out = self.replay(flux[start:start + chunk_size])
+            yield {
+                'start': start,
+                'samples': out['energy'].size,
+                'threats': int(np.count_nonzero(out['threats'])),
+                'pulse_energy': float(out['cost'].sum()),
+                'min_energy': float(out['energy'].min()),
+                'end_energy': self.energy_bank,
+            }
+
+    def replay_file(self, source, chunk_size=86400):
+        """Aggregated replay_chunks() summary over a whole recording."""
+        summary = {'samples': 0, 'threats': 0, 'pulse_energy': 0.0, 'min_energy': self.energy_bank}
+        for chunk in self.replay_chunks(source, chunk_size):
+            summary['samples'] += chunk['samples']
+            summary['threats'] += chunk['threats']
+            summary['pulse_energy'] += chunk['pulse_energy']
+            summary['min_energy'] = min(summary['min_energy'], chunk['min_energy'])
+        summary['end_energy'] = self.energy_bank
+        return summary
+
+    def step(self, flux, dt=1.0):
+        """
+        Advances the shield by one flux sample covering `dt` seconds.
+        Returns (is_threat, pulse cost).
+        """
+        is_threat, delta = self.analyze_threat(flux)
+        
+        # Energy Logic (Property 7: Balance)
+        cost = 0
+        if is_threat:
+            # Pulse cost scales with flux intensity
+            cost = (flux / 20) 
+            self.energy_bank -= cost
+        
+        # Property 11: Realization (Constant recharge)
+        self.energy_bank = min(100.0, self.energy_bank + self.solar_input * dt)
+
+        if self.forecaster is not None:
+            self._precharge(flux, dt)
+        return is_threat, cost
+
+    def monitor_radiation(self, flux=None):
+        """
+        Executive-layer check: samples one second of flux (ambient 50 +/- 5
+        when none is given) through step(). Returns True when the base is
+        safe, False when a pulse had to be fired.
+        """
+        if flux is None:
+            flux = 50 + np.random.normal(0, 5)
+        is_threat, _ = self.step(flux)
+        return not is_threat
+
+    def _precharge(self, flux, dt):
+        """Tops up the bank when the forecast pulse demand would cut into the reserve."""
+        forecaster = self.forecaster
+        forecaster.update(flux)
+        if forecaster.flare_eta() is None:
+            return
+        if self.energy_bank - forecaster.expected_pulse_energy() < self.reserve:
+            boost = min(self.precharge_rate * dt, 100.0 - self.energy_bank)
+            self.energy_bank += boost
+            self.precharge_drawn += boost
+
+    def run_simulation(self, duration=60, render=False):
+        self.log.info("--- m-11 phase III: smart pulse shield active ---")
+        self.history.reserve(duration)
         
         for t in range(duration):
             # Simulate fluctuating solar environment
             flux = 50 + np.random.normal(0, 5)
             if t in range(20, 30): flux += (t - 15) * 5  # Simulated Solar Flare spike
             
-            is_threat, delta = self.analyze_threat(flux)
-            
-            # Energy Logic (Property 7: Balance)
-            cost = 0
-            if is_threat:
-                # Pulse cost scales with flux intensity
-                cost = (flux / 20) 
-                self.energy_bank -= cost
-            
-            # Property 11: Realization (Constant recharge)
-            self.energy_bank = min(100.0, self.energy_bank + self.solar_input)
+            is_threat, cost = self.step(flux)
             
             # Record telemetry
-            self.history['energy'].append(self.energy_bank)
-            self.history['flux'].append(flux)
-            self.history['threats'].append(100 if is_threat else 0)
-            self.history['time'].append(t)
+            self.history.append(self.energy_bank, flux, 100 if is_threat else 0)
 
-        self.plot_telemetry()
+        if render:
+            self.plot_telemetry()
+        return self.history
 
     def plot_telemetry(self):
+        import matplotlib.pyplot as plt
+
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
         
         # Plot 1: Solar Flux & Prediction Threshold
@@ -73,4 +289,4 @@ class M11SmartShield:
 
 if __name__ == "__main__":
     m11 = M11SmartShield()
-    m11.run_simulation()
+    m11.run_simulation(render=True)
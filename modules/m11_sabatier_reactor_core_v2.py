@@ -1,5 +1,52 @@
+import functools
+
 import numpy as np
-import matplotlib.pyplot as plt
+
+try:
+    from modules.m11_telemetry import TelemetryRecorder
+    from modules.m11_logging import get_logger
+except ImportError:  # executed as a standalone script from /modules
+    from m11_telemetry import TelemetryRecorder
+    from m11_logging import get_logger
+
+@functools.lru_cache(maxsize=None)
+def solar_curve(cycles=24):
+    """Hourly solar input over one sol, computed once per `cycles` and shared (read-only)."""
+    t = np.arange(cycles)
+    curve = np.maximum(0, 100 * np.sin(np.pi * t / cycles))
+    curve[0] = 0.0
+    curve.flags.writeable = False
+    return curve
+
+
+def _active_temperatures(n_active, temp0, target, heating_rate, rng):
+    """
+    Reactor temperature after each of `n_active` consecutive active hours.
+
+    Below target the reactor heats by `heating_rate` per hour; at or above it
+    the temperature resets to target + N(0, 5). A draw d < 0 is therefore
+    followed by ceil(-d / heating_rate) recovery hours at target + d + i * rate,
+    so the whole sequence is a repeat of (draw, recovery...) blocks and needs
+    no per-hour loop.
+    """
+    if n_active == 0:
+        return np.empty(0)
+
+    # Initial heating ramp from temp0
+    n_ramp = int(np.ceil((target - temp0) / heating_rate)) if temp0 < target else 0
+    ramp = temp0 + heating_rate * np.arange(1, min(n_ramp, n_active) + 1)
+    remaining = n_active - ramp.size
+    if remaining == 0:
+        return ramp
+
+    draws = rng.normal(0, 5, remaining)
+    block = 1 + np.ceil(np.maximum(0.0, -draws) / heating_rate).astype(np.int64)
+    owner = np.repeat(np.arange(remaining), block)[:remaining]
+    start = np.cumsum(block) - block
+    offset = np.arange(remaining) - start[owner]
+    steady = target + draws[owner] + offset * heating_rate
+    return np.concatenate([ramp, steady])
+
 
 class M11SabatierController:
     """
@@ -12,51 +59,126 @@ class M11SabatierController:
         self.methane_total = 0.0
         self.energy_overhead = 12.0 # Power needed just to stay online
         self.catalyst_health = 1.0  # 1.0 = perfect
-        self.history = {'time': [], 'temp': [], 'ch4': [], 'energy': []}
+        self.activation_threshold = 30.0 # Minimum solar power to operate
+        self.heating_rate = 25.0 # Degrees gained per active hour below target
+        self.wear_probability = 0.05 # Chance of catalyst wear per active hour
+        self.wear_step = 0.01 # Catalyst health lost per wear event
+        self.history = TelemetryRecorder({'temp': np.float64, 'ch4': np.float64, 'energy': np.float64})
+        self.log = get_logger("M11-Sabatier")
+
+    def step_hour(self, solar_input):
+        """Advances the reactor by one hour of `solar_input`; returns the net energy surplus."""
+        current_energy = max(0, solar_input)
+        if current_energy <= self.activation_threshold: # Minimum power to operate
+            return current_energy # IDLE
+
+        # ACTIVE: Heating logic with limit (Property 6: Constraint)
+        if self.temp < self.target_temp:
+            self.temp += self.heating_rate
+        else:
+            self.temp = self.target_temp + np.random.normal(0, 5) # Thermal noise
 
-    def simulate_day(self, cycles=24):
-        print(f"--- M-11 ISRU REACTOR: 24h OPERATIONAL CYCLE ---")
+        # Sabatier Production (Efficiency depends on Temp & Catalyst)
+        temp_efficiency = 1.0 if self.temp > 300 else (self.temp / 300)
+        yield_rate = 5.0 * temp_efficiency * self.catalyst_health
+        
+        # Consuming energy based on production
+        energy_cost = yield_rate * 8.0 + self.energy_overhead
+        current_energy = max(0, current_energy - energy_cost)
+        
+        self.methane_total += yield_rate
+        # Random catalyst wear (Entropy)
+        if np.random.random() < self.wear_probability:
+            self.catalyst_health -= self.wear_step
+        return current_energy
+
+    def simulate_day(self, cycles=24, render=False):
+        self.log.info("--- M-11 ISRU REACTOR: 24h OPERATIONAL CYCLE ---")
+        self.history.reserve(cycles)
         
-        current_energy = 0
         for t in range(cycles):
             # 1. Solar Curve (Input Energy)
-            solar_input = 100 * np.sin(np.pi * t / cycles) if 0 < t < cycles else 0
-            current_energy = max(0, solar_input)
+            solar_input = float(solar_curve(cycles)[t])
             
             # 2. Reactor Logic
-            status = "IDLE"
-            yield_rate = 0
-            
-            if current_energy > 30: # Minimum power to operate
-                status = "ACTIVE"
-                # Heating logic with limit (Property 6: Constraint)
-                if self.temp < self.target_temp:
-                    self.temp += 25.0
-                else:
-                    self.temp = self.target_temp + np.random.normal(0, 5) # Thermal noise
-
-                # Sabatier Production (Efficiency depends on Temp & Catalyst)
-                temp_efficiency = 1.0 if self.temp > 300 else (self.temp / 300)
-                yield_rate = 5.0 * temp_efficiency * self.catalyst_health
-                
-                # Consuming energy based on production
-                energy_cost = yield_rate * 8.0 + self.energy_overhead
-                current_energy = max(0, current_energy - energy_cost)
-                
-                self.methane_total += yield_rate
-                # Random catalyst wear (Entropy)
-                if np.random.random() < 0.05:
-                    self.catalyst_health -= 0.01
+            current_energy = self.step_hour(solar_input)
 
             # Log Telemetry
-            self.history['time'].append(t)
-            self.history['temp'].append(self.temp)
-            self.history['ch4'].append(self.methane_total)
-            self.history['energy'].append(current_energy)
+            self.history.append(self.temp, self.methane_total, current_energy)
+
+        if render:
+            self.visualize()
+        return self.history
+
+    def simulate_sols(self, n_sols=1, cycles=24, record=False, rng=None):
+        """
+        Vectorized multi-sol simulation (same statistics as simulate_day).
+        The solar curve is precomputed once, the active-hours mask is tiled
+        over all sols, temperatures come from the closed-form heating/noise
+        blocks and catalyst wear / methane totals from cumulative sums.
+        Temperature and catalyst state carry across sols and are written back
+        to the controller. Returns per-sol totals; `record=True` also appends
+        the hourly series to self.history.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        solar = np.tile(solar_curve(cycles), n_sols)
+        active = solar > self.activation_threshold
+        n_active = int(np.count_nonzero(active))
+
+        temps = _active_temperatures(n_active, self.temp, self.target_temp, self.heating_rate, rng)
+        temp_efficiency = np.where(temps > 300, 1.0, temps / 300)
 
-        self.visualize()
+        # Catalyst health before each active hour (wear applies after production)
+        wear = rng.random(n_active) < self.wear_probability
+        health = self.catalyst_health - self.wear_step * (np.cumsum(wear) - wear)
+        yield_rate = 5.0 * temp_efficiency * health
+        energy_cost = yield_rate * 8.0 + self.energy_overhead
+
+        hourly_yield = np.zeros(solar.size)
+        hourly_cost = np.zeros(solar.size)
+        hourly_wear = np.zeros(solar.size)
+        hourly_yield[active] = yield_rate
+        hourly_cost[active] = energy_cost
+        hourly_wear[active] = wear
+
+        if record:
+            hourly_temp = np.empty(solar.size)
+            # Idle hours hold the last active temperature
+            last = np.maximum.accumulate(np.where(active, np.arange(solar.size), -1))
+            active_rank = np.cumsum(active) - 1
+            hourly_temp[:] = self.temp
+            held = last >= 0
+            hourly_temp[held] = temps[active_rank[last[held]]]
+            self.history.extend(temp=hourly_temp,
+                                ch4=self.methane_total + np.cumsum(hourly_yield),
+                                energy=np.where(active, np.maximum(0, solar - hourly_cost), solar))
+
+        if n_active:
+            self.temp = float(temps[-1])
+            self.catalyst_health -= self.wear_step * int(np.count_nonzero(wear))
+        self.methane_total += float(yield_rate.sum())
+
+        per_sol = lambda x: x.reshape(n_sols, cycles).sum(axis=1)
+        return {
+            'methane': per_sol(hourly_yield),
+            'energy_used': per_sol(hourly_cost),
+            'wear_events': per_sol(hourly_wear).astype(np.int64),
+            'active_hours': per_sol(active.astype(np.int64)),
+            'methane_total': self.methane_total,
+            'catalyst_health': self.catalyst_health,
+            'temp': self.temp,
+        }
+
+    def simulate_day_vectorized(self, cycles=24, render=False, rng=None):
+        """Loop-free equivalent of simulate_day for one sol."""
+        self.simulate_sols(1, cycles, record=True, rng=rng)
+        if render:
+            self.visualize()
+        return self.history
 
     def visualize(self):
+        import matplotlib.pyplot as plt
+
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
         
         ax1.plot(self.history['time'], self.history['temp'], color='coral', lw=2, label='Reactor Temp (°C)')
@@ -76,4 +198,4 @@ class M11SabatierController:
         plt.show()
 
 if __name__ == "__main__":
-    M11SabatierController().simulate_day()
+    M11SabatierController().simulate_day(render=True)
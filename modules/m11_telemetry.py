@@ -0,0 +1,194 @@
+"""
+MARS-11: Columnar Telemetry Recorder
+------------------------------------
+Preallocated, typed NumPy columns shared by every simulation module.
+Per-step rows go into a small flat buffer (one list.extend per step) that is
+written into the contiguous columns a block at a time, so scalar loops keep
+list-append speed while the history stays compact. Columns can spill to
+memory-mapped .npy files for very long runs.
+"""
+
+import os
+
+import numpy as np
+
+
+class TelemetryRecorder:
+    """
+    Records one row per simulation step into typed columns.
+
+    The 'time' column is not stored: it is derived from the row index as
+    time_origin + index * time_step. Columns are returned as zero-copy views
+    of the recorded rows, so existing `history['energy']` style access keeps
+    working. Rows from append() are buffered and written `block_rows` at a
+    time; every read flushes the buffer first.
+    """
+    def __init__(self, columns, capacity=1024, time_step=1.0, time_origin=0.0, spill_dir=None, block_rows=4096):
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        if not self.dtypes:
+            raise ValueError("TelemetryRecorder needs at least one column")
+        self.time_step = time_step
+        self.time_origin = time_origin
+        self.spill_dir = spill_dir
+        self.length = 0  # Rows written into the columns (buffered rows not included)
+        self.capacity = 0
+        self._arrays = {}
+        self._columns = []
+        self._width = len(self.dtypes)
+        self._pending = []  # Buffered rows, flattened in column order
+        self._pending_limit = max(1, int(block_rows)) * self._width
+        self._allocate(max(1, int(capacity)))
+
+    # --- storage -------------------------------------------------------
+
+    def _path(self, name):
+        return os.path.join(self.spill_dir, f"{name}.npy")
+
+    def _new_column(self, name, capacity):
+        if self.spill_dir is None:
+            return np.empty(capacity, dtype=self.dtypes[name])
+        path = self._path(name)
+        if name in self._arrays:
+            path += ".grow"
+        return np.lib.format.open_memmap(path, mode='w+', dtype=self.dtypes[name], shape=(capacity,))
+
+    def _allocate(self, capacity):
+        if self.spill_dir is not None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+        for name in self.dtypes:
+            column = self._new_column(name, capacity)
+            old = self._arrays.get(name)
+            if old is not None:
+                column[:self.length] = old[:self.length]
+                if self.spill_dir is not None:
+                    column.flush()
+                    del old
+                    self._arrays.pop(name)
+                    os.replace(self._path(name) + ".grow", self._path(name))
+            self._arrays[name] = column
+        self._columns = list(self._arrays.values())
+        self.capacity = capacity
+
+    def reserve(self, rows):
+        """Ensures room for `rows` more rows, growing geometrically."""
+        self._flush()
+        self._grow(rows)
+
+    def _grow(self, rows):
+        needed = self.length + rows
+        if needed > self.capacity:
+            self._allocate(max(needed, 2 * self.capacity))
+
+    def spill(self, spill_dir):
+        """Moves the recorded columns to memory-mapped .npy files in `spill_dir`."""
+        if self.spill_dir is not None:
+            return
+        self._flush()
+        in_memory = self._arrays
+        self.spill_dir = spill_dir
+        self._arrays = {}
+        os.makedirs(spill_dir, exist_ok=True)
+        for name, old in in_memory.items():
+            column = self._new_column(name, self.capacity)
+            column[:self.length] = old[:self.length]
+            self._arrays[name] = column
+        self._columns = list(self._arrays.values())
+
+    def close(self):
+        """
+        Trims spilled .npy files to the recorded length and reopens them
+        read-only. Appending afterwards transparently grows them again.
+        """
+        if self.spill_dir is None:
+            return
+        self._flush()
+        for name in self.dtypes:
+            old = self._arrays.pop(name)
+            trimmed = np.lib.format.open_memmap(self._path(name) + ".grow", mode='w+',
+                                                dtype=self.dtypes[name], shape=(self.length,))
+            trimmed[:] = old[:self.length]
+            trimmed.flush()
+            del old, trimmed
+            os.replace(self._path(name) + ".grow", self._path(name))
+            self._arrays[name] = np.load(self._path(name), mmap_mode='r')
+        self._columns = list(self._arrays.values())
+        self.capacity = self.length
+
+    # --- recording -----------------------------------------------------
+
+    def append(self, *values):
+        """Records one row; values follow the column order given at construction."""
+        if len(values) != self._width:
+            raise ValueError(f"expected {self._width} values ({', '.join(self.dtypes)}), got {len(values)}")
+        pending = self._pending
+        pending.extend(values)
+        if len(pending) >= self._pending_limit:
+            self._flush()
+
+    def _flush(self):
+        """Writes the buffered rows into the columns, one slice per column."""
+        pending = self._pending
+        if not pending:
+            return
+        width = self._width
+        rows = len(pending) // width
+        self._grow(rows)
+        n = self.length
+        for i, column in enumerate(self._columns):
+            column[n:n + rows] = pending[i::width]
+        pending.clear()
+        self.length = n + rows
+
+    def extend(self, **columns):
+        """Records a block of rows at once (every column, all of the same length)."""
+        missing = [name for name in self.dtypes if name not in columns]
+        unknown = [name for name in columns if name not in self.dtypes]
+        if missing or unknown:
+            raise ValueError(f"extend() needs exactly the columns {list(self.dtypes)} "
+                             f"(missing: {missing}, unknown: {unknown})")
+        lengths = {name: len(values) for name, values in columns.items()}
+        rows = next(iter(lengths.values()), 0)
+        if any(n != rows for n in lengths.values()):
+            raise ValueError(f"extend() columns differ in length: {lengths}")
+        self.reserve(rows)
+        n = self.length
+        for name, values in columns.items():
+            self._arrays[name][n:n + rows] = values
+        self.length = n + rows
+
+    def clear(self):
+        self._pending.clear()
+        self.length = 0
+
+    # --- access --------------------------------------------------------
+
+    @property
+    def time(self):
+        return self.time_origin + np.arange(len(self)) * self.time_step
+
+    def __getitem__(self, name):
+        if name == 'time':
+            return self.time
+        self._flush()
+        return self._arrays[name][:self.length]
+
+    def __contains__(self, name):
+        return name == 'time' or name in self._arrays
+
+    def __len__(self):
+        return self.length + len(self._pending) // self._width
+
+    def keys(self):
+        return ['time'] + list(self.dtypes)
+
+    def as_dict(self):
+        """Zero-copy views of every stored column plus the derived time axis."""
+        return {name: self[name] for name in self.keys()}
+
+    def as_structured(self):
+        """Packs the recorded rows into one structured array (this copies)."""
+        dtype = [('time', np.float64)] + [(name, dt) for name, dt in self.dtypes.items()]
+        out = np.empty(len(self), dtype=dtype)
+        for name in self.keys():
+            out[name] = self[name]
+        return out
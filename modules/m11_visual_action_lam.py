@@ -5,65 +5,223 @@ Implements VLA (Vision-Language-Action) logic with entropy and error rates.
 """
 
 import random
-import time
+from collections import defaultdict
+
+try:
+    from modules.m11_clock import SystemClock
+    from modules.m11_logging import get_logger
+except ImportError:  # executed as a standalone script from /modules
+    from m11_clock import SystemClock
+    from m11_logging import get_logger
+
+
+class UIElement:
+    """Compact dashboard widget record; status changes keep the registry index in sync."""
+    __slots__ = ('label', 'x', 'y', 'order', '_status', '_registry')
+
+    def __init__(self, label, x, y, status, order=0, registry=None):
+        self.label = label
+        self.x = x
+        self.y = y
+        self.order = order
+        self._status = status
+        self._registry = registry
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        old, self._status = self._status, value
+        if self._registry is not None and old != value:
+            self._registry._reindex(self, old, value)
+
+    # Dict-style access keeps `el['status']` callers working
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+
+class UIRegistry:
+    """
+    Indexed UI element store: label -> element for O(1) lookup, and
+    status -> set of labels, updated on every status change, so alert
+    queries cost O(#matches) instead of a scan of every widget.
+    """
+    def __init__(self, elements=()):
+        self.by_label = {}
+        self.by_status = defaultdict(set)
+        for el in elements:
+            self.add(el['label'], el['x'], el['y'], el['status'])
+
+    def add(self, label, x, y, status):
+        element = UIElement(label, x, y, status, order=len(self.by_label), registry=self)
+        self.by_label[label] = element
+        self.by_status[status].add(label)
+        return element
+
+    def _reindex(self, element, old, new):
+        self.by_status[old].discard(element.label)
+        self.by_status[new].add(element.label)
+
+    def get(self, label):
+        return self.by_label.get(label)
+
+    def labels_with_status(self, *statuses):
+        """Labels currently in any of `statuses`, in dashboard order."""
+        labels = set().union(*(self.by_status.get(s, ()) for s in statuses))
+        return sorted(labels, key=lambda label: self.by_label[label].order)
+
+    def __iter__(self):
+        return iter(self.by_label.values())
+
+    def __len__(self):
+        return len(self.by_label)
+
 
 class VisualLAMAgent:
-    def __init__(self):
+    def __init__(self, clock=None, max_retries=3, backoff=0.05, backoff_cap=0.5, seed=None):
         self.name = "Optimus-LAM-V2"
+        self.log = get_logger(self.name)
+        # Own entropy stream: concurrent heals don't interleave with other modules' draws
+        self.rng = random.Random(seed)
         self.precision_rate = 0.92  # 8% chance of a miss-click due to vibration/radiation
-        self.screen_elements = [
+        self.scan_delay = 0.8  # Seconds of optical acquisition per scan (0 for batch runs)
+        self.clock = SystemClock() if clock is None else clock  # SimulatedClock for virtual time
+        self.max_retries = max_retries  # Extra click attempts per alert after a miss
+        self.backoff = backoff  # First recalibration delay (s), doubled per retry
+        self.backoff_cap = backoff_cap  # Upper bound on a single recalibration delay (s)
+        self.alerts_resolved = 0
+        self.alerts_failed = 0
+        self.heal_time = 0.0  # Clock seconds spent inside heal protocols
+        self.screen_elements = UIRegistry([
             {"label": "Reactor Start", "x": 120, "y": 450, "status": "idle"},
             {"label": "Shield Level", "x": 500, "y": 100, "status": "active"},
             {"label": "Oxygen Scrubber", "x": 400, "y": 300, "status": "nominal"},
             {"label": "Manual Override", "x": 900, "y": 800, "status": "ready"}
-        ]
+        ])
 
     def randomize_environment(self):
         """Property 7: Balance - Simulating dynamic environmental changes."""
         for el in self.screen_elements:
-            if random.random() < 0.2:  # 20% chance of status change per Sol
-                el['status'] = random.choice(["active", "alert", "maintenance", "error"])
-        print(f"[{self.name}] UI Environment synchronized. State updated.")
+            if self.rng.random() < 0.2:  # 20% chance of status change per Sol
+                el['status'] = self.rng.choice(["active", "alert", "maintenance", "error"])
+        self.log.info("UI Environment synchronized. State updated.")
 
     def scan_interface(self):
         """Simulates visual perception of the dashboard."""
-        print(f"[{self.name}] Scanning visual matrix...")
-        time.sleep(0.8)
-        alerts = [el['label'] for el in self.screen_elements if el['status'] in ["alert", "error"]]
-        return alerts
+        self.log.info("Scanning visual matrix...")
+        if self.scan_delay:
+            self.clock.sleep(self.scan_delay)
+        return self.screen_elements.labels_with_status("alert", "error")
+
+    async def ascan_interface(self):
+        """Non-blocking scan: yields to other dashboards during optical acquisition."""
+        self.log.info("Scanning visual matrix...")
+        if self.scan_delay:
+            await self.clock.asleep(self.scan_delay)
+        return self.screen_elements.labels_with_status("alert", "error")
 
     def visual_click(self, label):
         """Simulates coordinate-based interaction with potential for error."""
-        for el in self.screen_elements:
-            if el['label'] == label:
-                # Property 9: Practical Limitation - Physical error simulation
-                if random.random() > self.precision_rate:
-                    print(f"[{self.name}] CRITICAL: Miss-click! Optical parallax error at ({el['x']}, {el['y']}).")
-                    return False
-                
-                print(f"[{self.name}] Precision Click: Target '{label}' at ({el['x']}, {el['y']}).")
-                el['status'] = "processing"
+        el = self.screen_elements.get(label)
+        if el is None:
+            return False
+
+        # Property 9: Practical Limitation - Physical error simulation
+        if self.rng.random() > self.precision_rate:
+            self.log.warning("CRITICAL: Miss-click! Optical parallax error at (%s, %s).", el.x, el.y)
+            return False
+        
+        self.log.info("Precision Click: Target '%s' at (%s, %s).", label, el.x, el.y)
+        el.status = "processing"
+        return True
+
+    def _retry_delays(self):
+        """Bounded exponential backoff: backoff, 2*backoff, ... capped at backoff_cap."""
+        return [min(self.backoff_cap, self.backoff * 2 ** i) for i in range(self.max_retries)]
+
+    def _record(self, issue, success):
+        if success:
+            self.alerts_resolved += 1
+            self.log.info("Resolution: %s corrected via LAM interaction.", issue)
+        else:
+            self.alerts_failed += 1
+            self.log.error("RETRY BUDGET EXHAUSTED: %s left for the next cycle.", issue)
+
+    def _fix(self, issue):
+        self.log.warning("Visual Alert Detected: %s. Attempting fix...", issue)
+        if self.visual_click(issue):
+            return True
+        for delay in self._retry_delays():
+            self.log.info("RETRY REQUIRED: Coordination recalibration in progress.")
+            self.clock.sleep(delay)
+            if self.visual_click(issue):
+                return True
+        return False
+
+    async def _afix(self, issue):
+        self.log.warning("Visual Alert Detected: %s. Attempting fix...", issue)
+        if self.visual_click(issue):
+            return True
+        for delay in self._retry_delays():
+            self.log.info("RETRY REQUIRED: Coordination recalibration in progress.")
+            await self.clock.asleep(delay)
+            if self.visual_click(issue):
                 return True
         return False
 
     def self_heal_protocol(self):
         """Autonomous error correction via visual interaction."""
+        start = self.clock.now()
         self.randomize_environment()
         alerts = self.scan_interface()
         
         if not alerts:
-            print(f"[{self.name}] System Visuals: All Nominal.")
-            return True
-
+            self.log.info("System Visuals: All Nominal.")
         for issue in alerts:
-            print(f"[{self.name}] Visual Alert Detected: {issue}. Attempting fix...")
-            success = self.visual_click(issue)
-            if success:
-                print(f"[{self.name}] Resolution: {issue} corrected via LAM interaction.")
-            else:
-                print(f"[{self.name}] RETRY REQUIRED: Coordination recalibration in progress.")
+            self._record(issue, self._fix(issue))
+        self.heal_time += self.clock.now() - start
+        return True
+
+    async def aself_heal_protocol(self):
+        """Async heal: alerts on one dashboard are retried concurrently."""
+        start = self.clock.now()
+        self.randomize_environment()
+        alerts = await self.ascan_interface()
+
+        if not alerts:
+            self.log.info("System Visuals: All Nominal.")
+        results = await self.clock.gather(*(self._afix(issue) for issue in alerts))
+        for issue, success in zip(alerts, results):
+            self._record(issue, success)
+        self.heal_time += self.clock.now() - start
         return True
 
+    def heal_throughput(self):
+        """Alerts resolved per clock second spent healing."""
+        return self.alerts_resolved / self.heal_time if self.heal_time else 0.0
+
+
+async def heal_dashboards(agents):
+    """
+    Scans and heals several dashboards (sharing one clock) concurrently;
+    returns alerts resolved per second overall.
+    """
+    if not agents:
+        return 0.0
+    clock = agents[0].clock
+    start = clock.now()
+    resolved = sum(a.alerts_resolved for a in agents)
+    await clock.gather(*(a.aself_heal_protocol() for a in agents))
+    elapsed = clock.now() - start
+    resolved = sum(a.alerts_resolved for a in agents) - resolved
+    return resolved / elapsed if elapsed else 0.0
+
+
 if __name__ == "__main__":
     agent = VisualLAMAgent()
     for sol in range(1, 4):
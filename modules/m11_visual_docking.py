@@ -1,5 +1,11 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+try:
+    from modules.m11_telemetry import TelemetryRecorder
+    from modules.m11_logging import get_logger
+except ImportError:  # executed as a standalone script from /modules
+    from m11_telemetry import TelemetryRecorder
+    from m11_logging import get_logger
 
 class M11VisualEngine:
     def __init__(self, mass=100000, beta_base=0.6):
@@ -9,15 +15,18 @@ class M11VisualEngine:
         self.Kp = 1800.0  # Коэффициент тяги
         self.Kd = 5200.0  # Коэффициент демпфирования (сопротивление)
         
-        # Списки для хранения данных графика
-        self.history = {'pos': [], 'vel': [], 'rs': [], 'time': []}
+        # Телеметрия для графиков (время = (шаг + 1) * dt)
+        self.history = TelemetryRecorder({'pos': np.float64, 'vel': np.float64, 'rs': np.float64},
+                                         time_step=self.dt, time_origin=self.dt)
+        self.log = get_logger("M11-Docking")
 
-    def run_simulation(self):
+    def run_simulation(self, render=False):
         pos, vel = 50.0, -2.0  # Дистанция 50м, скорость 2м/с к цели
         target_pos = 0.05
         t = 0
         
-        print("--- m-11 simulation started ---")
+        self.log.info("--- m-11 simulation started ---")
+        self.history.reserve(800)
         
         for step in range(800): # Ограничение 80 сек
             noise = np.random.normal(0, 0.04)
@@ -38,18 +47,112 @@ class M11VisualEngine:
             t += self.dt
             
             # Запись данных
-            self.history['pos'].append(pos)
-            self.history['vel'].append(vel)
-            self.history['rs'].append(rs)
-            self.history['time'].append(t)
+            self.history.append(pos, vel, rs)
             
             if pos <= target_pos:
-                print(f"target reached at {t:.1f}s")
+                self.log.info("target reached at %.1fs", t)
                 break
 
-        self.plot_results()
+        if render:
+            self.plot_results()
+        return self.history
+
+    def check_alignment(self, tolerance=0.05):
+        """
+        Executive-layer check: one noisy optical range measurement of the
+        docking target (same sensor noise as run_simulation). True when the
+        measured offset is within `tolerance` metres.
+        """
+        return abs(np.random.normal(0, 0.04)) <= tolerance
+
+    def run_batch(self, trajectories=1000, pos=50.0, vel=-2.0, mass=None, max_steps=800, block_size=64, rng=None):
+        """
+        Batched run_simulation: advances M trajectories as arrays.
+        `pos`, `vel` and `mass` may be scalars or (M,) arrays of initial
+        conditions. Noise is pregenerated in (block_size, M) blocks, so member
+        i sees the same noise sequence whatever the other members do (common
+        random numbers across gain settings with the same seed). A trajectory
+        is frozen once pos <= target_pos.
+        """
+        rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        m_total = trajectories
+        target_pos = 0.05
+        p = np.broadcast_to(np.asarray(pos, dtype=np.float64), (m_total,)).copy()
+        v = np.broadcast_to(np.asarray(vel, dtype=np.float64), (m_total,)).copy()
+        m = np.broadcast_to(np.asarray(self.mass if mass is None else mass, dtype=np.float64), (m_total,)).copy()
+
+        arrival_time = np.full(m_total, np.nan)
+        arrival_velocity = np.full(m_total, np.nan)
+        overshoot = np.full(m_total, np.nan)
+        peak_velocity = np.abs(v)
+        rs_sum = np.zeros(m_total)
+        rs_max = np.full(m_total, -np.inf)
+        steps = np.zeros(m_total, dtype=np.int64)
+        active = np.arange(m_total)
+
+        step = 0
+        while step < max_steps and active.size:
+            noise_block = rng.normal(0, 0.04, size=(min(block_size, max_steps - step), m_total))
+            for noise_row in noise_block:
+                noise = noise_row[active]
+
+                # Resonance Index (Property 7)
+                dynamic_beta = self.beta * (1 + np.abs(noise))
+                rs = 1 / (p + np.abs(v) + (1 - dynamic_beta) + 1e-6)
+
+                # PD-Control (Property 8)
+                thrust = (self.Kp * (target_pos - (p + noise))) - (self.Kd * v)
+                v += (thrust / m) * self.dt
+                p += v * self.dt
+                step += 1
+
+                rs_sum[active] += rs
+                rs_max[active] = np.maximum(rs_max[active], rs)
+                peak_velocity[active] = np.maximum(peak_velocity[active], np.abs(v))
+                steps[active] += 1
+
+                arrived = p <= target_pos
+                if arrived.any():
+                    done = active[arrived]
+                    arrival_time[done] = step * self.dt
+                    arrival_velocity[done] = np.abs(v[arrived])
+                    overshoot[done] = target_pos - p[arrived]
+                    keep = ~arrived
+                    active, p, v, m = active[keep], p[keep], v[keep], m[keep]
+                    if not active.size:
+                        break
+
+        success = np.isfinite(arrival_time)
+        return {
+            'success': success,
+            'arrival_time': arrival_time,
+            'arrival_velocity': arrival_velocity,
+            'overshoot': overshoot,
+            'peak_velocity': peak_velocity,
+            'rs_mean': rs_sum / np.maximum(steps, 1),
+            'rs_max': rs_max,
+            'summary': self.batch_summary(success, arrival_time, arrival_velocity, peak_velocity, rs_sum / np.maximum(steps, 1)),
+        }
+
+    @staticmethod
+    def batch_summary(success, arrival_time, arrival_velocity, peak_velocity, rs_mean, percentiles=(5, 50, 95)):
+        """Success rate plus percentile bands of the batched docking statistics."""
+        def bands(x):
+            x = x[np.isfinite(x)]
+            if x.size == 0:
+                return {f"p{q}": float('nan') for q in percentiles}
+            return {f"p{q}": float(v) for q, v in zip(percentiles, np.percentile(x, percentiles))}
+        return {
+            'success_rate': float(success.mean()),
+            'arrival_time': bands(arrival_time),
+            'arrival_velocity': bands(arrival_velocity),
+            'peak_velocity': bands(peak_velocity),
+            'rs_mean': bands(rs_mean),
+        }
 
     def plot_results(self):
+        import matplotlib.pyplot as plt
+
         fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 12), sharex=True)
         plt.subplots_adjust(hspace=0.3)
 
@@ -72,9 +175,9 @@ class M11VisualEngine:
         ax3.set_title('resonance stability (m-11 core metric)')
         ax3.grid(True, alpha=0.3)
 
-        print("displaying telemetry charts...")
+        self.log.info("displaying telemetry charts...")
         plt.show()
 
 if __name__ == "__main__":
     sim = M11VisualEngine()
-    sim.run_simulation()
+    sim.run_simulation(render=True)
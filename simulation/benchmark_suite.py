@@ -0,0 +1,308 @@
+"""
+MARS-11: Headless Benchmark Suite
+---------------------------------
+Times the main simulation entry points with fixed seeds and scalable
+workloads, and writes machine-readable results so runs can be compared
+across commits:
+
+    python simulation/benchmark_suite.py --units 200 --sols 50 -o bench.json
+    python simulation/benchmark_suite.py -o new.json --compare bench.json
+
+Each benchmark is a sequence of operations (one packet, one sol, one full
+run...), rebuilt from the same seed for every round. After `warmup` untimed
+rounds, rounds repeat until at least `min_rounds` have run and `min_time`
+seconds have been measured. The throughput is the median over rounds (what
+--compare uses), per-operation latencies of all rounds give the percentiles,
+and a separate tracemalloc-instrumented round gives the peak Python heap
+usage. Logging is switched off, so the numbers measure the simulation, not
+message formatting or the terminal.
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import m11_logging
+from modules.m11_clock import SimulatedClock
+from modules.m11_optimus_agentic_swarm import M11AgenticSwarm
+from modules.m11_optimus_site_scan import OptimusSiteSurvey
+from modules.m11_gnosis_purifier import GnosisPurifier
+from modules.m11_visual_docking import M11VisualEngine
+from modules.m11_sabatier_reactor_core_v2 import M11SabatierController
+from modules.m11_radiation_shield import M11SmartShield
+from simulation.master_controller import MarsBaseManager
+
+DEFAULTS = {'units': 15, 'grid_size': 200, 'packets': 10000, 'steps': 100, 'sols': 20, 'repeat': 5}
+TIMING = {'warmup': 1, 'min_rounds': 5, 'min_time': 1.0}
+PERCENTILES = (50, 90, 99)
+
+BENCHMARKS = {}
+
+
+class BenchmarkSkipped(Exception):
+    """Raised by a factory whose subsystem cannot be built in this environment."""
+
+
+def benchmark(name, unit):
+    """
+    Registers a benchmark factory. factory(params) builds fresh state and
+    returns (op, n_ops, items_per_op): op(i) runs operation i, and each
+    operation counts as `items_per_op` units of work for the throughput.
+    Runs that can stop early pass items_per_op=None and have op(i) return
+    the work it actually did.
+    """
+    def register(factory):
+        BENCHMARKS[name] = (factory, unit)
+        return factory
+    return register
+
+
+@benchmark('swarm', 'unit-steps')
+def bench_swarm(params):
+    def op(i):
+        # run() stops at mission success: count the steps actually simulated
+        return len(M11AgenticSwarm(params['units']).run(params['steps'])) * params['units']
+    return op, params['repeat'], None
+
+
+@benchmark('site_scan', 'cells')
+def bench_site_scan(params):
+    surveys = [OptimusSiteSurvey(params['grid_size']) for _ in range(params['repeat'])]
+    return (lambda i: surveys[i].analyze_site()), params['repeat'], params['grid_size'] ** 2
+
+
+@benchmark('gnosis', 'packets')
+def bench_gnosis(params):
+    purifier = GnosisPurifier(seed=0)
+    relevance = np.random.uniform(0, 1, params['packets'])
+    packets = [{'content': 'uplink', 'relevance': float(r)} for r in relevance]
+    return (lambda i: purifier.process_stream(packets[i])), params['packets'], 1
+
+
+@benchmark('docking', 'steps')
+def bench_docking(params):
+    def op(i):
+        # Runs end at arrival: count the integration steps actually taken
+        return len(M11VisualEngine().run_simulation())
+    return op, params['repeat'], None
+
+
+@benchmark('reactor', 'hours')
+def bench_reactor(params):
+    reactor = M11SabatierController()
+    return (lambda i: reactor.simulate_day(cycles=24)), params['sols'], 24
+
+
+@benchmark('shield', 'seconds')
+def bench_shield(params):
+    def op(i):
+        M11SmartShield().run_simulation(duration=params['steps'])
+    return op, params['repeat'], params['steps']
+
+
+@benchmark('base', 'sols')
+def bench_base(params):
+    manager = MarsBaseManager()
+    manager.visual_navigator.clock = SimulatedClock()
+    return (lambda i: manager.run_daily_protocol()), params['sols'], 1
+
+
+def _seed(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _run_ops(op, n_ops):
+    """Per-operation latencies and the values the operations returned."""
+    latencies = np.empty(n_ops)
+    returned = [None] * n_ops
+    clock = time.perf_counter
+    for i in range(n_ops):
+        start = clock()
+        returned[i] = op(i)
+        latencies[i] = clock() - start
+    return latencies, returned
+
+
+def _round(factory, params, seed):
+    """One timed round on fresh state: (seconds, work items, per-op latencies)."""
+    _seed(seed)
+    op, n_ops, items_per_op = factory(params)
+    start = time.perf_counter()
+    latencies, returned = _run_ops(op, n_ops)
+    elapsed = time.perf_counter() - start
+    items = n_ops * items_per_op if items_per_op is not None else sum(returned)
+    return elapsed, items, latencies
+
+
+def run_benchmark(name, params, seed=11, memory=True, timing=None):
+    """Runs one registered benchmark and returns its result record."""
+    factory, unit = BENCHMARKS[name]
+    timing = dict(TIMING, **(timing or {}))
+    try:
+        for _ in range(timing['warmup']):
+            _round(factory, params, seed)
+        rounds, measured = [], 0.0
+        while len(rounds) < timing['min_rounds'] or measured < timing['min_time']:
+            rounds.append(_round(factory, params, seed))
+            measured += rounds[-1][0]
+    except BenchmarkSkipped as e:
+        return {'name': name, 'skipped': str(e)}
+    seconds = np.array([r[0] for r in rounds])
+    items = rounds[0][1]
+    rates = np.array([r[1] / r[0] for r in rounds if r[0] > 0])
+    latencies = np.concatenate([r[2] for r in rounds])
+
+    peak = None
+    if memory:
+        # Separate pass: tracemalloc slows allocation-heavy code too much to time under it
+        _seed(seed)
+        tracemalloc.start()
+        try:
+            op, n_ops, _ = factory(params)
+            _run_ops(op, n_ops)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'name': name,
+        'unit': unit,
+        'ops': latencies.size // len(rounds),
+        'items': items,
+        'rounds': len(rounds),
+        'total_s': float(seconds.sum()),
+        'round_s': float(np.median(seconds)),
+        'throughput': float(np.median(rates)) if rates.size else None,
+        'throughput_iqr': [float(q) for q in np.percentile(rates, (25, 75))] if rates.size else None,
+        'latency_s': {
+            'mean': float(latencies.mean()),
+            'min': float(latencies.min()),
+            'max': float(latencies.max()),
+            **{f"p{p}": float(np.percentile(latencies, p)) for p in PERCENTILES},
+        },
+        'peak_memory_bytes': peak,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(names=None, params=None, seed=11, memory=True, timing=None):
+    """Runs the selected benchmarks (all by default) with logging disabled."""
+    params = dict(DEFAULTS, **(params or {}))
+    timing = dict(TIMING, **(timing or {}))
+    previous = m11_logging.configure(level=m11_logging.OFF)
+    try:
+        results = [run_benchmark(name, params, seed, memory, timing) for name in (names or BENCHMARKS)]
+    finally:
+        m11_logging.configure(**previous)
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': seed,
+            'params': params,
+            'timing': timing,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Change of the median round throughput per benchmark against a baseline
+    report. A benchmark regresses when it drops by more than `threshold`.
+    """
+    before = {r['name']: r for r in baseline['results'] if 'skipped' not in r}
+    rows = []
+    for result in current['results']:
+        old = before.get(result['name'])
+        if 'skipped' in result or old is None or not old.get('throughput'):
+            continue
+        change = result['throughput'] / old['throughput'] - 1.0
+        rows.append({'name': result['name'], 'baseline': old['throughput'], 'current': result['throughput'],
+                     'change': change, 'regression': change < -threshold})
+    return rows
+
+
+def _format_report(report):
+    lines = []
+    for r in report['results']:
+        if 'skipped' in r:
+            lines.append(f"  {r['name']:<10} SKIPPED ({r['skipped']})")
+            continue
+        lat = r['latency_s']
+        memory = f"{r['peak_memory_bytes'] / 1024:,.0f} KiB" if r['peak_memory_bytes'] is not None else "n/a"
+        lines.append(f"  {r['name']:<10} {r['throughput']:>14,.0f} {r['unit']}/s ({r['rounds']} rounds) | "
+                     f"p50 {lat['p50'] * 1e3:.3f} ms p99 {lat['p99'] * 1e3:.3f} ms | peak {memory}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MARS-11 headless benchmark suite")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument('--units', type=int, default=DEFAULTS['units'], help="swarm size")
+    parser.add_argument('--grid-size', type=int, default=DEFAULTS['grid_size'], help="site survey grid edge")
+    parser.add_argument('--packets', type=int, default=DEFAULTS['packets'], help="purifier packet count")
+    parser.add_argument('--steps', type=int, default=DEFAULTS['steps'], help="swarm steps / shield seconds")
+    parser.add_argument('--sols', type=int, default=DEFAULTS['sols'], help="reactor and base sols")
+    parser.add_argument('--repeat', type=int, default=DEFAULTS['repeat'], help="runs of single-shot benchmarks")
+    parser.add_argument('--seed', type=int, default=11)
+    parser.add_argument('--warmup', type=int, default=TIMING['warmup'], help="untimed rounds per benchmark")
+    parser.add_argument('--min-rounds', type=int, default=TIMING['min_rounds'], help="timed rounds per benchmark, at least")
+    parser.add_argument('--min-time', type=float, default=TIMING['min_time'],
+                        help="seconds of timed rounds per benchmark, at least")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('-o', '--output', help="write the JSON report here")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON report to compare throughput against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="regression threshold (fraction)")
+    args = parser.parse_args(argv)
+
+    params = {'units': args.units, 'grid_size': args.grid_size, 'packets': args.packets,
+              'steps': args.steps, 'sols': args.sols, 'repeat': args.repeat}
+    timing = {'warmup': args.warmup, 'min_rounds': max(1, args.min_rounds), 'min_time': args.min_time}
+    report = run_suite(args.only, params, args.seed, memory=not args.no_memory, timing=timing)
+
+    print("--- M-11 BENCHMARK SUITE ---")
+    print(_format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        print(f"--- vs {args.compare} ---")
+        if baseline['meta'].get('params') != report['meta']['params']:
+            print("  WARNING: workload parameters differ from the baseline")
+        for row in rows:
+            flag = "  REGRESSION" if row['regression'] else ""
+            print(f"  {row['name']:<10} {row['change']:+7.1%}{flag}")
+        if any(row['regression'] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+MARS-11: Docking Gain-Scheduling Search
+---------------------------------------
+Searches the (Kp, Kd, mass) space of the M11VisualEngine PD controller for
+gains that minimize docking time while keeping the impact velocity under a
+limit. Every point is evaluated with the batched integrator on the same
+seed (common random numbers), in parallel, and cached on disk keyed by its
+parameters and seed so re-running a sweep only computes new points.
+"""
+
+import sys
+import os
+import json
+import hashlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.m11_visual_docking import M11VisualEngine
+
+
+def evaluate_gains(point):
+    """Batched docking statistics for one {'Kp', 'Kd', 'mass', 'trajectories', 'seed', 'max_steps'} point."""
+    engine = M11VisualEngine(mass=point['mass'])
+    engine.Kp, engine.Kd = point['Kp'], point['Kd']
+    result = engine.run_batch(point['trajectories'], max_steps=point['max_steps'], rng=point['seed'])
+    success = result['success']
+    impact = result['arrival_velocity'][success]
+    return dict(point,
+                success_rate=float(success.mean()),
+                mean_time=float(np.mean(result['arrival_time'][success])) if success.any() else None,
+                impact_p95=float(np.percentile(impact, 95)) if success.any() else None,
+                impact_max=float(impact.max()) if success.any() else None,
+                peak_velocity=float(np.max(result['peak_velocity'])))
+
+
+class DockingGainSearch:
+    def __init__(self, velocity_limit=0.5, trajectories=500, seed=0, max_steps=800,
+                 cache_dir=None, workers=None):
+        self.velocity_limit = velocity_limit
+        self.trajectories = trajectories
+        self.seed = seed
+        self.max_steps = max_steps
+        self.cache_dir = cache_dir
+        self.workers = workers or os.cpu_count() or 1
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # --- disk cache ----------------------------------------------------
+
+    def _point(self, Kp, Kd, mass):
+        return {'Kp': float(Kp), 'Kd': float(Kd), 'mass': float(mass),
+                'trajectories': self.trajectories, 'seed': self.seed, 'max_steps': self.max_steps}
+
+    def _cache_path(self, point):
+        digest = hashlib.sha1(json.dumps(point, sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _load(self, point):
+        if self.cache_dir is None:
+            return None
+        path = self._cache_path(point)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _store(self, result):
+        if self.cache_dir is None:
+            return
+        point = {k: result[k] for k in ('Kp', 'Kd', 'mass', 'trajectories', 'seed', 'max_steps')}
+        path = self._cache_path(point)
+        with open(path + ".tmp", 'w') as f:
+            json.dump(result, f)
+        os.replace(path + ".tmp", path)
+
+    # --- evaluation ----------------------------------------------------
+
+    def feasible(self, result):
+        return result['success_rate'] == 1.0 and result['impact_p95'] <= self.velocity_limit
+
+    def evaluate(self, points):
+        """Evaluates (Kp, Kd, mass) triples, computing only uncached points (in parallel)."""
+        points = [self._point(*p) for p in points]
+        results = [self._load(p) for p in points]
+        todo = [p for p, r in zip(points, results) if r is None]
+        self.last_computed = len(todo)
+
+        if todo:
+            if self.workers > 1 and len(todo) > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    computed = list(pool.map(evaluate_gains, todo))
+            else:
+                computed = [evaluate_gains(p) for p in todo]
+            for result in computed:
+                self._store(result)
+            fresh = iter(computed)
+            results = [r if r is not None else next(fresh) for r in results]
+
+        for result in results:
+            result['feasible'] = self.feasible(result)
+        return results
+
+    def best(self, results):
+        """Fastest feasible result, or None."""
+        feasible = [r for r in results if r['feasible']]
+        return min(feasible, key=lambda r: r['mean_time']) if feasible else None
+
+    def grid_search(self, Kp_values, Kd_values, masses):
+        results = self.evaluate(list(itertools.product(Kp_values, Kd_values, masses)))
+        return {'results': results, 'schedule': self._schedule(results)}
+
+    def adaptive_search(self, masses, Kp_range=(200.0, 20000.0), Kd_range=(1000.0, 100000.0),
+                        points=7, rounds=3, shrink=0.35):
+        """
+        Per-mass log-space grid search that zooms in around the best feasible
+        point each round (falling back to the whole range if none is feasible).
+        """
+        all_results = []
+        for mass in masses:
+            kp_lo, kp_hi = map(np.log10, Kp_range)
+            kd_lo, kd_hi = map(np.log10, Kd_range)
+            for _ in range(rounds):
+                grid = itertools.product(np.logspace(kp_lo, kp_hi, points), np.logspace(kd_lo, kd_hi, points), [mass])
+                results = self.evaluate(list(grid))
+                all_results.extend(results)
+                best = self.best(results)
+                if best is None:
+                    break
+                kp_span, kd_span = (kp_hi - kp_lo) * shrink / 2, (kd_hi - kd_lo) * shrink / 2
+                kp_c, kd_c = np.log10(best['Kp']), np.log10(best['Kd'])
+                kp_lo, kp_hi = kp_c - kp_span, kp_c + kp_span
+                kd_lo, kd_hi = kd_c - kd_span, kd_c + kd_span
+        return {'results': all_results, 'schedule': self._schedule(all_results)}
+
+    def _schedule(self, results):
+        """Gain schedule: the best feasible (Kp, Kd) per mass."""
+        schedule = {}
+        for mass in sorted({r['mass'] for r in results}):
+            best = self.best([r for r in results if r['mass'] == mass])
+            schedule[mass] = None if best is None else {
+                'Kp': best['Kp'], 'Kd': best['Kd'], 'mean_time': best['mean_time'], 'impact_p95': best['impact_p95']}
+        return schedule
+
+
+if __name__ == "__main__":
+    search = DockingGainSearch(velocity_limit=0.5, trajectories=200, seed=11,
+                               cache_dir=os.path.join(os.path.dirname(__file__), '.docking_cache'))
+    report = search.adaptive_search(masses=[50000, 100000, 200000])
+    print("--- M-11 DOCKING GAIN SCHEDULE ---")
+    for mass, gains in report['schedule'].items():
+        if gains is None:
+            print(f"  mass {mass:.0f} kg: no feasible gains found")
+        else:
+            print(f"  mass {mass:.0f} kg: Kp={gains['Kp']:.0f} Kd={gains['Kd']:.0f} "
+                  f"| t={gains['mean_time']:.1f}s | impact p95={gains['impact_p95']:.2f} m/s")
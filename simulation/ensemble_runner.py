@@ -0,0 +1,193 @@
+"""
+MARS-11: Monte Carlo Ensemble Runner
+------------------------------------
+Advances N independent stochastic trajectories of the swarm, shield and
+reactor models together, with the member index as a batch dimension.
+Go/no-go decisions are made on the returned percentile bands.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.m11_optimus_agentic_swarm import M11AgenticSwarm
+from modules.m11_radiation_shield import M11SmartShield
+from modules.m11_sabatier_reactor_core_v2 import M11SabatierController, solar_curve
+
+
+def percentile_bands(values, percentiles=(5, 50, 95)):
+    """Returns {'p5': ..., 'p50': ..., 'p95': ...}, ignoring NaN members."""
+    values = np.asarray(values, dtype=float)
+    if not np.any(np.isfinite(values)):
+        return {f"p{p:g}": float('nan') for p in percentiles}
+    return {f"p{p:g}": float(v) for p, v in zip(percentiles, np.nanpercentile(values, percentiles))}
+
+
+class M11EnsembleRunner:
+    """
+    Batched Monte Carlo driver.
+    Every member carries its own (N,) state and an `active` mask, so members
+    that terminate early (e.g. swarm mission success) stop evolving.
+    """
+    def __init__(self, members=10000, seed=None, percentiles=(5, 50, 95)):
+        self.members = members
+        self.percentiles = percentiles
+        self.rng = np.random.default_rng(seed)
+
+    def _bands(self, values):
+        return percentile_bands(values, self.percentiles)
+
+    def run_swarm(self, unit_count=15, steps=100):
+        """
+        Ensemble version of M11AgenticSwarm.run.
+        A member is fully described by its (Energy, Build, Repair) head-count,
+        so the per-unit coin flips of the rebalance become binomial draws.
+        """
+        template = M11AgenticSwarm(unit_count=0)
+        n = self.members
+        rng = self.rng
+
+        counts = rng.multinomial(unit_count, [1 / 3] * 3, size=n)
+        n_energy, n_build, n_repair = counts[:, 0], counts[:, 1], counts[:, 2]
+        energy = np.full(n, template.energy)
+        integrity = np.full(n, template.integrity)
+        min_energy = np.full(n, np.inf)  # Recorded steps only, like the scalar history
+        success_time = np.full(n, np.nan)
+        active = np.ones(n, dtype=bool)
+
+        for t in range(steps):
+            idx = np.flatnonzero(active)
+            if idx.size == 0:
+                break
+            e, i = energy[idx], integrity[idx]
+            ne, nb, nr = n_energy[idx], n_build[idx], n_repair[idx]
+
+            # 1. Dynamic Adaptation (same branch order as _rebalance_roles)
+            low = e < 40
+            mid = ~low & (i < e) & (e > 60)
+            to_repair = (i < 50) & (nr < 3)
+
+            b_to_e = np.where(low, rng.binomial(nb, 0.3), 0)
+            r_to_e = np.where(low, rng.binomial(nr, 0.3), 0)
+            rest_build = nb - b_to_e
+            repaired = np.where(to_repair, rest_build, 0)
+
+            ne_new = np.where(mid, 0, ne + b_to_e + r_to_e)
+            nb_new = rest_build - repaired + np.where(mid, ne, 0)
+            nr_new = nr - r_to_e + repaired
+
+            # 2. Agentic Leadership (AAB)
+            lead_bonus = np.where((e < 50) & (ne_new > 5), 1.4, 1.1)
+
+            # 3. Resource Calculation
+            e = np.minimum(100, e + ne_new * 0.8 - 2.0)
+            powered = e > 20
+            wear = rng.uniform(1, 3, size=idx.size)
+            net_damage = np.maximum(0, wear - nr_new * 0.5)
+            i = np.where(powered, np.minimum(100, i + nb_new * 1.2 * lead_bonus - net_damage), i)
+
+            energy[idx], integrity[idx] = e, i
+            n_energy[idx], n_build[idx], n_repair[idx] = ne_new, nb_new, nr_new
+            min_energy[idx] = np.minimum(min_energy[idx], e)
+
+            done = (e >= 100) & (i >= 100)
+            success_time[idx[done]] = t
+            active[idx[done]] = False
+
+        succeeded = np.isfinite(success_time)
+        return {
+            'members': n,
+            'success_rate': float(succeeded.mean()),
+            'time_to_success': self._bands(success_time),
+            'min_energy': self._bands(min_energy),
+            'final_integrity': self._bands(integrity),
+        }
+
+    def run_shield(self, duration=60):
+        """Ensemble version of M11SmartShield.run_simulation."""
+        template = M11SmartShield()
+        n = self.members
+
+        energy = np.full(n, template.energy_bank)
+        prev_flux = np.full(n, template.prev_flux)
+        min_energy = energy.copy()
+        pulses = np.zeros(n, dtype=np.int64)
+        pulse_energy = np.zeros(n)
+
+        for t in range(duration):
+            flux = 50 + self.rng.normal(0, 5, size=n)
+            if 20 <= t < 30:
+                flux += (t - 15) * 5  # Simulated Solar Flare spike
+
+            delta = flux - prev_flux
+            prev_flux = flux
+            is_threat = (flux > 80) | (delta > 15)
+
+            cost = np.where(is_threat, flux / 20, 0.0)
+            energy = np.minimum(100.0, energy - cost + template.solar_input)
+
+            pulses += is_threat
+            pulse_energy += cost
+            np.minimum(min_energy, energy, out=min_energy)
+
+        return {
+            'members': n,
+            'min_energy': self._bands(min_energy),
+            'final_energy': self._bands(energy),
+            'pulses': self._bands(pulses),
+            'pulse_energy': self._bands(pulse_energy),
+            'below_reserve_rate': float((min_energy < 20).mean()),
+        }
+
+    def run_reactor(self, cycles=24, controller=None):
+        """
+        Ensemble version of M11SabatierController.simulate_day.
+        Parameters and initial state come from `controller` (default: a
+        fresh controller), so tuned settings ensemble as tuned; it is not
+        modified.
+        """
+        template = M11SabatierController() if controller is None else controller
+        n = self.members
+
+        temp = np.full(n, template.temp)
+        methane = np.full(n, template.methane_total)
+        catalyst = np.full(n, template.catalyst_health)
+        surplus = np.zeros(n)
+
+        for current_energy in solar_curve(cycles):
+            if current_energy <= template.activation_threshold:
+                surplus += current_energy
+                continue
+
+            heating = temp < template.target_temp
+            noise = self.rng.normal(0, 5, size=n)
+            temp = np.where(heating, temp + template.heating_rate, template.target_temp + noise)
+
+            temp_efficiency = np.where(temp > 300, 1.0, temp / 300)
+            yield_rate = 5.0 * temp_efficiency * catalyst
+            energy_cost = yield_rate * 8.0 + template.energy_overhead
+            surplus += np.maximum(0, current_energy - energy_cost)
+
+            methane += yield_rate
+            catalyst -= np.where(self.rng.random(n) < template.wear_probability, template.wear_step, 0.0)
+
+        return {
+            'members': n,
+            'total_methane': self._bands(methane),
+            'catalyst_health': self._bands(catalyst),
+            'energy_surplus': self._bands(surplus),
+        }
+
+
+if __name__ == "__main__":
+    runner = M11EnsembleRunner(members=10000, seed=11)
+    for name, report in [("SWARM", runner.run_swarm()),
+                         ("SHIELD", runner.run_shield()),
+                         ("REACTOR", runner.run_reactor())]:
+        print(f"--- M-11 ENSEMBLE: {name} ({report['members']} members) ---")
+        for key, value in report.items():
+            if key != 'members':
+                print(f"  {key}: {value}")
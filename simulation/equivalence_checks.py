@@ -0,0 +1,177 @@
+"""
+MARS-11: Reference Equivalence Checks
+-------------------------------------
+The vectorized fast paths replace per-step reference loops with closed-form
+math. These checks pin each one to the loop it replaces, so a change to the
+reference model (step(), step_hour()...) cannot silently drift from it:
+
+    python simulation/equivalence_checks.py
+
+Every check is seeded and prints its worst deviation; the script exits with
+status 1 when any check fails.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules import m11_logging
+from modules.m11_radiation_shield import M11SmartShield
+from modules.m11_sabatier_reactor_core_v2 import M11SabatierController, _active_temperatures, solar_curve
+
+CHECKS = {}
+
+
+class EquivalenceError(AssertionError):
+    """A fast path no longer matches its reference loop."""
+
+
+def check(name):
+    def register(func):
+        CHECKS[name] = func
+        return func
+    return register
+
+
+def _expect(ok, message):
+    if not ok:
+        raise EquivalenceError(message)
+
+
+def _flare_series(rng, seconds=20000):
+    """Ambient flux with ramped flares, a plateau above threshold and a sharp spike."""
+    flux = 50 + rng.normal(0, 5, seconds)
+    flux[2000:2040] += np.arange(40) * 4
+    flux[7000:7600] += 45  # Long flare: drains the bank below zero
+    flux[12000] += 30
+    return flux
+
+
+@check('shield_replay')
+def check_shield_replay(seed=11, chunk=997):
+    """M11SmartShield.replay (closed-form clamp, chunked) against the step() loop."""
+    flux = _flare_series(np.random.default_rng(seed))
+    fast, ref = M11SmartShield(), M11SmartShield()
+
+    outs = [fast.replay(flux[i:i + chunk]) for i in range(0, flux.size, chunk)]
+    energy = np.concatenate([o['energy'] for o in outs])
+    threats = np.concatenate([o['threats'] for o in outs])
+    cost = np.concatenate([o['cost'] for o in outs])
+
+    ref_energy = np.empty(flux.size)
+    ref_threats = np.empty(flux.size, dtype=bool)
+    ref_cost = np.empty(flux.size)
+    for i, sample in enumerate(flux.tolist()):
+        ref_threats[i], ref_cost[i] = ref.step(sample)
+        ref_energy[i] = ref.energy_bank
+
+    _expect(np.array_equal(threats, ref_threats), "threat flags differ from step()")
+    _expect(np.array_equal(cost, ref_cost), "pulse costs differ from step()")
+    err = float(np.abs(energy - ref_energy).max())
+    _expect(err < 1e-9, f"energy deviates from step() by {err:.3g}")
+    _expect(ref_energy.min() < 0 and ref_energy.max() == 100.0, "series does not exercise both clamp regimes")
+    _expect(fast.prev_flux == ref.prev_flux, "prev_flux not carried like step()")
+    return f"max energy error {err:.2g} over {flux.size} s"
+
+
+class _RecordedDraws:
+    """Stands in for a Generator: normal() hands back noise recorded from step_hour()."""
+    def __init__(self, draws):
+        self.draws = np.asarray(draws, dtype=np.float64)
+
+    def normal(self, loc, scale, size):
+        out = np.zeros(size)
+        n = min(size, self.draws.size)
+        out[:n] = self.draws[:n]
+        return out
+
+
+@check('reactor_temperatures')
+def check_reactor_temperatures(seed=11, sols=200):
+    """_active_temperatures (heating/noise blocks) against step_hour() on the same noise."""
+    np.random.seed(seed)
+    reactor = M11SabatierController()
+    reactor.heating_rate = 4.0  # Slow recovery: noise dips span several heating hours
+    temp0 = reactor.temp
+    temps, draws = [], []
+    for solar in np.tile(solar_curve(), sols).tolist():
+        if solar <= reactor.activation_threshold:
+            reactor.step_hour(solar)
+            continue
+        noisy = reactor.temp >= reactor.target_temp
+        reactor.step_hour(solar)
+        temps.append(reactor.temp)
+        if noisy:
+            draws.append(reactor.temp - reactor.target_temp)
+
+    fast = _active_temperatures(len(temps), temp0, reactor.target_temp, reactor.heating_rate,
+                                _RecordedDraws(draws))
+    err = float(np.abs(fast - np.array(temps)).max())
+    _expect(err < 1e-9, f"temperatures deviate from step_hour() by {err:.3g}")
+    _expect(min(draws) < -2 * reactor.heating_rate, "no multi-hour recovery block exercised")
+    return f"max temperature error {err:.2g} over {len(temps)} active hours"
+
+
+def _z(a, b):
+    """Two-sample z-score of the difference of means."""
+    se = np.sqrt(a.var(ddof=1) / a.size + b.var(ddof=1) / b.size)
+    return abs(a.mean() - b.mean()) / se if se > 0 else 0.0
+
+
+@check('reactor_multi_sol')
+def check_reactor_multi_sol(seed=11, replicates=1000, sols=5, z_limit=4.5, spread_limit=0.15):
+    """simulate_sols statistics against repeated simulate_day runs (methane, catalyst, temperature)."""
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    stats = {'methane': ([], []), 'catalyst': ([], []), 'temp': ([], [])}
+    for _ in range(replicates):
+        ref, fast = M11SabatierController(), M11SabatierController()
+        for _ in range(sols):
+            ref.simulate_day()
+        fast.simulate_sols(sols, rng=rng)
+        for name, a, b in (('methane', ref.methane_total, fast.methane_total),
+                           ('catalyst', ref.catalyst_health, fast.catalyst_health),
+                           ('temp', ref.temp, fast.temp)):
+            stats[name][0].append(a)
+            stats[name][1].append(b)
+
+    worst = []
+    for name, (ref, fast) in stats.items():
+        ref, fast = np.array(ref), np.array(fast)
+        z = _z(ref, fast)
+        spread = abs(fast.std() / ref.std() - 1) if ref.std() > 0 else 0.0
+        _expect(z < z_limit, f"{name} mean differs: z = {z:.2f}")
+        _expect(spread < spread_limit, f"{name} spread differs by {spread:.0%}")
+        worst.append(f"{name} z={z:.2f}")
+    return f"{replicates} x {sols} sols: " + ", ".join(worst)
+
+
+def run_checks(names=None):
+    """Runs the selected checks (all by default); returns {name: (ok, detail)}."""
+    previous = m11_logging.configure(level=m11_logging.OFF)
+    results = {}
+    try:
+        for name in names or CHECKS:
+            try:
+                results[name] = (True, CHECKS[name]())
+            except EquivalenceError as e:
+                results[name] = (False, str(e))
+    finally:
+        m11_logging.configure(**previous)
+    return results
+
+
+def main(argv=None):
+    names = (argv if argv is not None else sys.argv[1:]) or None
+    results = run_checks(names)
+    print("--- M-11 EQUIVALENCE CHECKS ---")
+    for name, (ok, detail) in results.items():
+        print(f"  {name:<22} {'ok' if ok else 'FAIL'}  {detail}")
+    return 0 if all(ok for ok, _ in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
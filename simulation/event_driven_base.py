@@ -0,0 +1,143 @@
+"""
+MARS-11: Event-Driven Base Simulation
+-------------------------------------
+Runs the shield, reactor and docking subsystems on one shared discrete-event
+scheduler instead of unrelated fixed-step loops. Work only happens when
+something changes: the reactor ticks only during its active daylight hours,
+the shield samples at a slow quiet rate and switches to 1 Hz only while a
+solar flare is in progress, and docking completion is a single event.
+"""
+
+import sys
+import os
+from collections import defaultdict
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.m11_event_scheduler import M11EventScheduler
+from modules.m11_radiation_shield import M11SmartShield
+from modules.m11_sabatier_reactor_core_v2 import M11SabatierController, solar_curve
+from modules.m11_visual_docking import M11VisualEngine
+
+HOUR = 3600.0
+SOL = 24 * HOUR  # The reactor model runs 24 Martian hours per sol
+
+
+class EventDrivenBase:
+    def __init__(self, quiet_period=60.0, alert_period=1.0, calm_samples=10, seed=None):
+        self.scheduler = M11EventScheduler()
+        self.shield = M11SmartShield()
+        self.reactor = M11SabatierController()
+        self.docking = M11VisualEngine()
+        self.rng = np.random.default_rng(seed)
+
+        self.quiet_period = quiet_period
+        self.alert_period = alert_period
+        self.calm_samples = calm_samples
+        self._calm = 0
+        self.flares = []  # (start, end, slope)
+        self.counters = defaultdict(int)
+
+        self.scheduler.subscribe('solar_flare', self._on_flare)
+        self.scheduler.subscribe('alert', self._on_alert)
+        self.scheduler.subscribe('docking_complete', self._on_docking_complete)
+
+        self._shield_task = self.scheduler.every(quiet_period, self._shield_tick)
+        self.scheduler.every(SOL, self._plan_sol)
+
+    # --- environment ---------------------------------------------------
+
+    def schedule_flare(self, start, duration=10.0, slope=5.0):
+        """Solar flare ramp (same shape as the shield demo) announced as a 'solar_flare' event."""
+        self.flares.append((start, start + duration, slope))
+        self.scheduler.emit('solar_flare', {'start': start, 'end': start + duration}, delay=start - self.scheduler.now)
+
+    def random_flares(self, sols, rate_per_sol=0.5):
+        """Poisson-distributed flares over the next `sols` sols."""
+        for start in self.rng.uniform(0, sols * SOL, self.rng.poisson(rate_per_sol * sols)):
+            self.schedule_flare(self.scheduler.now + float(start))
+
+    def flux_at(self, t):
+        flux = 50 + self.rng.normal(0, 5)
+        for start, end, slope in self.flares:
+            if start <= t < end:
+                flux += (t - start + 5) * slope
+        return flux
+
+    # --- subsystems ----------------------------------------------------
+
+    def _shield_tick(self, now):
+        period = self._shield_task.period
+        is_threat, _ = self.shield.step(self.flux_at(now), dt=period)
+        self.counters['shield_samples'] += 1
+        self.counters['shield_pulses'] += bool(is_threat)
+        if self.shield.energy_bank < 20:
+            self.scheduler.emit('alert', {'source': 'shield', 'energy': self.shield.energy_bank})
+
+        if period == self.alert_period:
+            self._calm = 0 if is_threat else self._calm + 1
+            if self._calm >= self.calm_samples and not any(s <= now < e for s, e, _ in self.flares):
+                self.flares = [f for f in self.flares if f[1] > now]
+                return self.quiet_period
+        return None
+
+    def _plan_sol(self, now):
+        """Registers reactor ticks for this sol's active hours only; the night is skipped."""
+        curve = solar_curve(24)
+        active = np.flatnonzero(curve > self.reactor.activation_threshold)
+        if active.size:
+            self.scheduler.every(HOUR, self._reactor_tick, start=now + active[0] * HOUR,
+                                 until=now + active[-1] * HOUR)
+
+    def _reactor_tick(self, now):
+        hour = int(round((now % SOL) / HOUR))
+        self.reactor.step_hour(float(solar_curve(24)[hour]))
+        self.counters['reactor_ticks'] += 1
+
+    def schedule_docking(self, start):
+        """Runs one approach and emits 'docking_complete' at its arrival time."""
+        def approach():
+            result = self.docking.run_batch(1, rng=self.rng)
+            if result['success'][0]:
+                self.scheduler.emit('docking_complete', {'arrival_velocity': float(result['arrival_velocity'][0])},
+                                    delay=float(result['arrival_time'][0]))
+        self.scheduler.at(start, approach)
+
+    # --- event handlers ------------------------------------------------
+
+    def _on_flare(self, now, payload):
+        self.counters['flares'] += 1
+        self._calm = 0
+        task = self._shield_task
+        if task.period != self.alert_period:
+            # Re-arm the shield tick at the alert rate, starting now
+            task.cancelled = True
+            self._shield_task = self.scheduler.every(self.alert_period, self._shield_tick)
+
+    def _on_alert(self, now, payload):
+        self.counters['alerts'] += 1
+
+    def _on_docking_complete(self, now, payload):
+        self.counters['dockings'] += 1
+
+    def run(self, sols=1):
+        processed = self.scheduler.run(until=self.scheduler.now + sols * SOL)
+        return {
+            'events': processed,
+            'sim_time': self.scheduler.now,
+            'methane_total': self.reactor.methane_total,
+            'shield_energy': self.shield.energy_bank,
+            **self.counters,
+        }
+
+
+if __name__ == "__main__":
+    base = EventDrivenBase(seed=11)
+    base.random_flares(sols=100, rate_per_sol=1.0)
+    base.schedule_docking(start=2 * HOUR)
+    report = base.run(sols=100)
+    print("--- M-11 EVENT-DRIVEN BASE: 100 SOLS ---")
+    for key, value in report.items():
+        print(f"  {key}: {value}")
@@ -15,80 +15,190 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Importing the specific modules from /modules/
 try:
-    from modules.m11_radiation_shield import RadiationShield
-    from modules.m11_optimus_agentic_swarm import OptimusSwarm
+    from modules.m11_radiation_shield import M11SmartShield
+    from modules.m11_optimus_agentic_swarm import M11AgenticSwarm
     from modules.m11_optimus_prospector_v3 import M11GIEPProspector
     from modules.m11_sabatier_reactor_core_v2 import M11SabatierController
-    from modules.m11_visual_docking import VisualDocking
+    from modules.m11_visual_docking import M11VisualEngine
     from modules.m11_visual_action_lam import VisualLAMAgent
     from modules.m11_gnosis_purifier import GnosisPurifier
     from modules.m11_bio_regen_logic import BioRegenSystem
+    from modules.m11_logging import get_logger
+    from modules.m11_profiler import NULL_STAGE
 except ImportError as e:
     print(f"[ERROR] Failed to import modules: {e}")
     sys.exit(1)
 
 class MarsBaseManager:
-    def __init__(self):
-        print("\n" + "="*45)
-        print("   MARS-11 COMMAND & CONTROL INTERFACE v1.2")
-        print("="*45)
-        
+    def __init__(self, profiler=None):
+        self.log = get_logger("M11-Master")  # Console tags come from the `tag` / `sol` fields
+        self.log.info("MARS-11 COMMAND & CONTROL INTERFACE v1.2", tag="SYSTEM")
+
         # Initializing core components
-        self.shield = RadiationShield()
-        self.swarm = OptimusSwarm()
+        self.shield = M11SmartShield()
+        self.swarm = M11AgenticSwarm()
         self.prospector = M11GIEPProspector()
         self.reactor = M11SabatierController()
-        self.docking = VisualDocking()
+        self.docking = M11VisualEngine()
         
         # Initializing Advanced Layers
-        self.visual_navigator = VisualLAMAgent()
+        # Seeded from the global stream, so random.seed() still reproduces a run
+        self.visual_navigator = VisualLAMAgent(seed=random.getrandbits(64))
         self.cognitive_filter = GnosisPurifier()
         self.life_support = BioRegenSystem()
         
         self.sol = 0
+        self.profiler = profiler  # Optional StageProfiler; None disables instrumentation
 
-    def run_daily_protocol(self):
-        """A synchronized operational sequence representing 1 Martian Sol."""
-        self.sol += 1
-        print(f"\n[SOL {self.sol}] --- INITIALIZING DAILY PROTOCOL ---")
+    # --- Instrumentation ---
+
+    def _stage(self, name):
+        """Profiling context for stage `name` (a shared no-op when profiling is off)."""
+        if self.profiler is None:
+            return NULL_STAGE
+        return self.profiler.stage(name, self.sol)
+
+    def _run_stage(self, name, stage, report):
+        with self._stage(name):
+            return stage(report)
+
+    async def _arun_stage(self, name, stage, report):
+        with self._stage(name):
+            return await stage(report)
 
-        # 1. COGNITIVE VALIDATION (Filtering incoming Earth commands)
-        print(f"[SYSTEM] Receiving data packets from Earth Deep Space Network...")
+    async def _acompute(self, name, stage, report):
+        """A compute-only stage as a coroutine, so it can be a node of the async graph."""
+        return self._run_stage(name, stage, report)
+
+    async def _anavigation_then_production(self, report):
+        # Both stages reassign swarm units, so they stay ordered
+        await self._acompute('navigation', self._navigation, report)
+        await self._acompute('production', self._production, report)
+
+    # --- Protocol stages (shared by the sequential and async protocols) ---
+
+    def _cognitive_validation(self, report):
+        """1. COGNITIVE VALIDATION (Filtering incoming Earth commands)"""
+        self.log.info("Receiving data packets from Earth Deep Space Network...", tag="SYSTEM")
         mock_packets = [
             {'content': 'Priority: Adjust shield harmonics', 'relevance': 0.9},
             {'content': 'Social: Trending topics on Mars-Net', 'relevance': 0.1}
         ]
         valid_orders = [p for p in mock_packets if self.cognitive_filter.process_stream(p)]
+        report['valid_orders'] = len(valid_orders)
 
-        # 2. SAFETY & ENVIRONMENT (Radiation & Bio-Regen)
+    def _safety_gate(self, report):
+        """2a. SAFETY (Radiation). Returns False when the sol must be aborted."""
         if not self.shield.monitor_radiation():
-            print("[ALERT] High Solar Activity! Emergency shielding active.")
-            return
-        
-        # Update Life Support Homeostasis
+            self.log.warning("High Solar Activity! Emergency shielding active.", tag="ALERT")
+            return False
+        report['shield_ok'] = True
+        return True
+
+    def _life_support(self, report):
+        """2b. ENVIRONMENT: Update Life Support Homeostasis"""
         # Simulating environment load based on sol activity
         env_load = random.uniform(0.5, 0.8)
-        self.life_support.update_homeostasis(env_load)
+        bio = self.life_support.update_homeostasis(env_load)
+        report['env_load'] = env_load
+        report['biomass_yield'] = bio['yield']
 
-        # 3. NAVIGATION & INTEGRITY
-        if not self.docking.check_alignment():
-            print("[MAINTENANCE] Alignment drift. Recalibrating via Swarm...")
+    def _navigation(self, report):
+        """3. NAVIGATION & INTEGRITY"""
+        report['aligned'] = bool(self.docking.check_alignment())
+        if not report['aligned']:
+            self.log.warning("Alignment drift. Recalibrating via Swarm...", tag="MAINTENANCE")
             self.swarm.reallocate_units(role="MAINTENANCE", count=2)
 
-        # 4. RESOURCE & PRODUCTION
+    def _production(self, report):
+        """4. RESOURCE & PRODUCTION"""
         purified_signal = self.prospector.purification_logic([0.85, 0.92, 0.78])
+        report['purified_signal'] = float(purified_signal)
         if purified_signal > 0.8:
-            print(f"[SUCCESS] Sub-surface H2O signal stable ({purified_signal:.2f})")
+            self.log.info("Sub-surface H2O signal stable (%.2f)", purified_signal, tag="SUCCESS")
             self.reactor.simulate_day(cycles=1)
             self.swarm.reallocate_units(role="MINING", count=4)
         else:
             self.swarm.reallocate_units(role="EXPLORATION", count=11)
+        report['methane_total'] = self.reactor.methane_total
 
-        # 5. VISUAL FINAL INSPECTION (LAM)
-        print("[LAM] Executing visual sanity check on all control panels...")
+    def _inspection(self, report):
+        """5. VISUAL FINAL INSPECTION (LAM)"""
+        self.log.info("Executing visual sanity check on all control panels...", tag="LAM")
         self.visual_navigator.self_heal_protocol()
 
-        print(f"[SOL {self.sol}] --- DAILY PROTOCOL COMPLETE ---")
+    async def _ainspection(self, report):
+        """5. VISUAL FINAL INSPECTION (LAM), without blocking the event loop"""
+        self.log.info("Executing visual sanity check on all control panels...", tag="LAM")
+        await self.visual_navigator.aself_heal_protocol()
+
+    def run_daily_protocol(self):
+        """
+        A synchronized operational sequence representing 1 Martian Sol.
+        Returns a per-sol report dict for aggregation by scenario runners.
+        """
+        self.sol += 1
+        report = {'sol': self.sol, 'shield_ok': False}
+        self.log.info("--- INITIALIZING DAILY PROTOCOL ---", sol=self.sol)
+
+        with self._stage('protocol'):
+            self._run_stage('cognitive_validation', self._cognitive_validation, report)
+            if not self._run_stage('safety_gate', self._safety_gate, report):
+                return report
+            self._run_stage('life_support', self._life_support, report)
+            self._run_stage('navigation', self._navigation, report)
+            self._run_stage('production', self._production, report)
+            self._run_stage('inspection', self._inspection, report)
+
+        self.log.info("--- DAILY PROTOCOL COMPLETE ---", sol=self.sol)
+        return report
+
+    async def run_daily_protocol_async(self):
+        """
+        Concurrent variant of run_daily_protocol, modelled as a dependency graph:
+
+            cognitive validation -> shield gate --+--> life support
+                                                  +--> navigation -> production
+                                                  +--> LAM inspection
+
+        The branches after the shield gate are coroutines gathered on one
+        event loop through the base clock (the LAM agent's), so a simulated
+        clock accounts for them. Tasks start in FIFO order and the compute
+        stages never yield, so a seeded sol draws the same random numbers as
+        the sequential protocol (the LAM agent has its own RNG). The
+        inspection awaits aself_heal_protocol, so the sol costs its critical
+        path (the LAM scan); gathering several bases with their shared
+        clock's gather() overlaps their scans and retries.
+        """
+        self.sol += 1
+        report = {'sol': self.sol, 'shield_ok': False}
+        self.log.info("--- INITIALIZING DAILY PROTOCOL (ASYNC) ---", sol=self.sol)
+
+        with self._stage('protocol'):
+            self._run_stage('cognitive_validation', self._cognitive_validation, report)
+            if not self._run_stage('safety_gate', self._safety_gate, report):
+                return report
+            # The LAM clock is the base's clock (virtual in batch runs)
+            await self.visual_navigator.clock.gather(
+                self._acompute('life_support', self._life_support, report),
+                self._anavigation_then_production(report),
+                self._arun_stage('inspection', self._ainspection, report),
+            )
+
+        self.log.info("--- DAILY PROTOCOL COMPLETE ---", sol=self.sol)
+        return report
+
+    def process_uplink(self, packets, chunk_size=1024):
+        """
+        Filters an endless Earth uplink through the cognitive filter in
+        constant memory, yielding validated orders one by one.
+        """
+        for validated in self.cognitive_filter.filter_stream(packets, chunk_size):
+            yield from validated
+
+    async def run_sols_async(self, sols):
+        """Runs `sols` consecutive async protocols and returns their reports."""
+        return [await self.run_daily_protocol_async() for _ in range(sols)]
 
 if __name__ == "__main__":
     manager = MarsBaseManager()
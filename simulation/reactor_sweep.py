@@ -0,0 +1,129 @@
+"""
+MARS-11: Sabatier Reactor Parameter Sweep
+-----------------------------------------
+Evaluates grids or Latin-hypercube samples of reactor settings with the
+vectorized multi-sol simulation, in parallel, and returns the Pareto front of
+methane yield vs. energy consumed vs. catalyst wear. Every configuration is
+simulated with the same seed (common random numbers) and memoized, so
+repeat configurations cost nothing.
+"""
+
+import sys
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.m11_sabatier_reactor_core_v2 import M11SabatierController
+
+# Tunable controller attributes
+PARAMETERS = ('target_temp', 'energy_overhead', 'activation_threshold', 'heating_rate')
+
+
+def evaluate_config(config, n_sols=30, cycles=24, seed=0):
+    """Runs one configuration for `n_sols` sols and returns its objectives."""
+    reactor = M11SabatierController()
+    for name, value in config.items():
+        if name not in PARAMETERS:
+            raise ValueError(f"unknown reactor parameter: {name}")
+        setattr(reactor, name, value)
+    start_health = reactor.catalyst_health
+    out = reactor.simulate_sols(n_sols, cycles, rng=np.random.default_rng(seed))
+    return {
+        'config': dict(config),
+        'methane': float(out['methane'].sum()),
+        'energy_used': float(out['energy_used'].sum()),
+        'catalyst_wear': start_health - reactor.catalyst_health,
+    }
+
+
+def _evaluate_packed(args):
+    return evaluate_config(*args)
+
+
+def grid(**axes):
+    """Cartesian product of parameter values: grid(target_temp=[300, 350], heating_rate=[20, 25])."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def latin_hypercube(bounds, n, seed=None):
+    """`n` Latin-hypercube samples from {'name': (low, high), ...}."""
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for name, (low, high) in bounds.items():
+        strata = (rng.permutation(n) + rng.random(n)) / n
+        samples[name] = low + strata * (high - low)
+    return [{name: float(samples[name][i]) for name in bounds} for i in range(n)]
+
+
+def pareto_front(results, maximize=('methane',), minimize=('energy_used', 'catalyst_wear')):
+    """Non-dominated subset of `results`, sorted by the first maximized objective (descending)."""
+    if not results:
+        return []
+    costs = np.array([[-r[k] for k in maximize] + [r[k] for k in minimize] for r in results])
+    keep = np.ones(len(results), dtype=bool)
+    for i in range(len(results)):
+        if not keep[i]:
+            continue
+        dominated = np.all(costs <= costs[i], axis=1) & np.any(costs < costs[i], axis=1)
+        if dominated.any():
+            keep[i] = False
+    front = [r for r, k in zip(results, keep) if k]
+    return sorted(front, key=lambda r: -r[maximize[0]])
+
+
+class ReactorSweep:
+    def __init__(self, n_sols=30, cycles=24, seed=0, workers=None):
+        self.n_sols = n_sols
+        self.cycles = cycles
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = {}
+
+    def _key(self, config):
+        return tuple(sorted((name, float(value)) for name, value in config.items()))
+
+    def evaluate(self, configs):
+        """Evaluates configurations, computing only those not in the cache."""
+        keys = [self._key(c) for c in configs]
+        missing = {}
+        for key, config in zip(keys, configs):
+            if key not in self.cache and key not in missing:
+                missing[key] = config
+
+        jobs = [(config, self.n_sols, self.cycles, self.seed) for config in missing.values()]
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                chunksize = max(1, len(jobs) // (4 * self.workers))
+                results = list(pool.map(_evaluate_packed, jobs, chunksize=chunksize))
+        else:
+            # The solar curve is cached per process, so serial runs share it directly
+            results = [_evaluate_packed(job) for job in jobs]
+
+        self.cache.update(zip(missing, results))
+        self.last_evaluated = len(jobs)
+        return [self.cache[key] for key in keys]
+
+    def run(self, configs):
+        results = self.evaluate(configs)
+        return {
+            'results': results,
+            'pareto': pareto_front(results),
+            'evaluated': self.last_evaluated,
+            'cached': len(configs) - self.last_evaluated,
+        }
+
+
+if __name__ == "__main__":
+    sweep = ReactorSweep(n_sols=60, seed=11)
+    configs = latin_hypercube({'target_temp': (250, 450), 'energy_overhead': (6, 18),
+                               'activation_threshold': (20, 60), 'heating_rate': (10, 40)}, n=200, seed=11)
+    report = sweep.run(configs)
+    print(f"--- M-11 REACTOR SWEEP: {report['evaluated']} evaluated, {len(report['pareto'])} on Pareto front ---")
+    for r in report['pareto'][:10]:
+        settings = ", ".join(f"{k}={v:.1f}" for k, v in r['config'].items())
+        print(f"  CH4 {r['methane']:.1f} | energy {r['energy_used']:.0f} | wear {r['catalyst_wear']:.2f} | {settings}")
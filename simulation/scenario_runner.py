@@ -0,0 +1,163 @@
+"""
+MARS-11: Parallel Scenario Runner
+---------------------------------
+Sweeps independent MarsBaseManager instances (base configurations x random
+seeds) across a process pool. Every scenario is seeded deterministically
+from its index, runs on a simulated clock (no real sleeps), and its per-sol reports are
+aggregated as they stream back.
+"""
+
+import sys
+import os
+import time
+import random
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from simulation.master_controller import MarsBaseManager
+from modules.m11_clock import SimulatedClock
+from modules import m11_logging
+
+
+def scenario_seed(base_seed, index):
+    """Deterministic 32-bit seed for scenario `index`, independent of worker scheduling."""
+    return int(np.random.SeedSequence(base_seed, spawn_key=(index,)).generate_state(1)[0])
+
+
+def _apply_overrides(manager, overrides):
+    """Applies {'reactor.target_temp': 360.0, ...} style attribute overrides."""
+    for path, value in overrides.items():
+        target = manager
+        *parents, attr = path.split('.')
+        for name in parents:
+            target = getattr(target, name)
+        setattr(target, attr, value)
+
+
+def run_scenario(scenario):
+    """
+    Worker entry point: builds one MarsBaseManager, seeds the global RNGs the
+    modules draw from, and runs `sols` daily protocols back to back.
+    """
+    random.seed(scenario['seed'])
+    np.random.seed(scenario['seed'])
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    # Quiet runs switch logging off, so no message is ever formatted
+    previous = m11_logging.configure(level=m11_logging.OFF) if scenario.get('quiet', True) else None
+    try:
+        manager = MarsBaseManager()
+        manager.visual_navigator.clock = SimulatedClock()  # Scan and retry delays in virtual time
+        _apply_overrides(manager, scenario.get('overrides', {}))
+        reports = [manager.run_daily_protocol() for _ in range(scenario['sols'])]
+    finally:
+        if previous is not None:
+            m11_logging.configure(**previous)
+
+    return {
+        'index': scenario['index'],
+        'seed': scenario['seed'],
+        'overrides': scenario.get('overrides', {}),
+        'sols': reports,
+        'wall_time': time.perf_counter() - wall,
+        'cpu_time': time.process_time() - cpu,
+    }
+
+
+class SolAggregator:
+    """Streaming per-sol statistics: counts plus running sum/min/max of numeric fields."""
+    def __init__(self):
+        self.scenarios = 0
+        self.sols = 0
+        self.fields = {}
+
+    def add(self, result):
+        self.scenarios += 1
+        for report in result['sols']:
+            self.sols += 1
+            for key, value in report.items():
+                if key == 'sol' or not isinstance(value, (int, float)):
+                    continue
+                stats = self.fields.setdefault(key, {'count': 0, 'sum': 0.0, 'min': float('inf'), 'max': float('-inf')})
+                stats['count'] += 1
+                stats['sum'] += value
+                stats['min'] = min(stats['min'], value)
+                stats['max'] = max(stats['max'], value)
+
+    def summary(self):
+        return {
+            'scenarios': self.scenarios,
+            'sols': self.sols,
+            'fields': {key: {'mean': s['sum'] / s['count'], 'min': s['min'], 'max': s['max'], 'count': s['count']}
+                       for key, s in self.fields.items()},
+        }
+
+
+class ScenarioRunner:
+    def __init__(self, workers=None, base_seed=0, quiet=True):
+        self.workers = workers or os.cpu_count() or 1
+        self.base_seed = base_seed
+        self.quiet = quiet
+
+    def scenarios(self, configs, sols=10, replicates=1):
+        """Expands base configurations x replicates into seeded scenario dicts."""
+        index = 0
+        for overrides in configs:
+            for _ in range(replicates):
+                yield {'index': index, 'seed': scenario_seed(self.base_seed, index),
+                       'sols': sols, 'overrides': dict(overrides), 'quiet': self.quiet}
+                index += 1
+
+    def run(self, configs=({},), sols=10, replicates=1, on_result=None, max_pending=None):
+        """
+        Runs every scenario and returns the aggregated summary.
+        Results are consumed as they complete (at most `max_pending` in flight),
+        so memory stays bounded however large the sweep is; `on_result` sees
+        each raw scenario result.
+        """
+        aggregator = SolAggregator()
+        max_pending = max_pending or 4 * self.workers
+        pending = set()
+        wall = time.perf_counter()
+        cpu_time = 0.0
+
+        def drain(block_until):
+            nonlocal pending, cpu_time
+            done, pending = wait(pending, return_when=block_until)
+            for future in done:
+                result = future.result()
+                cpu_time += result['cpu_time']
+                aggregator.add(result)
+                if on_result is not None:
+                    on_result(result)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for scenario in self.scenarios(configs, sols, replicates):
+                pending.add(pool.submit(run_scenario, scenario))
+                if len(pending) >= max_pending:
+                    drain(FIRST_COMPLETED)
+            while pending:
+                drain(FIRST_COMPLETED)
+
+        wall = time.perf_counter() - wall
+        summary = aggregator.summary()
+        summary['wall_time'] = wall
+        summary['workers'] = self.workers
+        summary['sols_per_second'] = summary['sols'] / wall if wall > 0 else float('inf')
+        summary['sols_per_second_per_core'] = summary['sols_per_second'] / self.workers
+        summary['worker_cpu_time'] = cpu_time
+        return summary
+
+
+if __name__ == "__main__":
+    runner = ScenarioRunner(base_seed=11)
+    configs = [{'reactor.target_temp': temp} for temp in (300.0, 350.0, 400.0)]
+    summary = runner.run(configs, sols=20, replicates=50)
+    print(f"--- M-11 SCENARIO SWEEP: {summary['scenarios']} scenarios, {summary['sols']} sols ---")
+    print(f"Throughput: {summary['sols_per_second']:.1f} sols/s "
+          f"({summary['sols_per_second_per_core']:.1f} sols/s/core on {summary['workers']} workers)")
+    for key, stats in summary['fields'].items():
+        print(f"  {key}: mean {stats['mean']:.3f} [{stats['min']:.3f}, {stats['max']:.3f}]")